@@ -0,0 +1,1685 @@
+bl_info = {
+    "name": "Smart 2D Animation Workflow",
+    "description": "Generalized 2D animation tools including Smart Bones, bendy parts, expressions, depth, automation, colouring, layering, hybrid animation, and experimental AI tweening",
+    "author": "Lowena Cove",
+    "version": (0, 4, 0),
+    "blender": (4, 0, 0),
+    "location": "3D View > Smart Bones",
+    "warning": "Requires FILM/TensorFlow or ToonCrafter/Torch for AI tweening; use install operator to auto-setup dependencies and paths. One-shot ToonCrafter runs (Keep Model Loaded off) need ffmpeg.",
+    "wiki_url": "https://github.com/sketchy-squirrel/smart-bones",
+    "category": "Rigging"
+}
+
+import bpy
+import re
+import os
+import sys
+import time
+from bpy.types import PropertyGroup
+from bpy.props import CollectionProperty
+
+# Only the Smart Bone tools, properties and UI load with the add-on. Stroke
+# interpolation, bendy rigging, AI tweening, the dependency installer and
+# colouring live in submodules that operators import on first use, so files
+# opened in background mode never pay for NumPy, multiprocessing or the AI code.
+_import_started = time.perf_counter()
+startup_timings = {}
+
+#---------------------------------------------------------------------
+#    Properties
+#---------------------------------------------------------------------
+
+class ColorItem(PropertyGroup):
+    color : bpy.props.FloatVectorProperty(
+        name="Color",
+        subtype='COLOR',
+        size=4,
+        min=0.0,
+        max=1.0,
+        default=(1.0, 1.0, 1.0, 1.0)
+    )
+
+# Smart Bone panel inputs, validated per scene when they change rather than on
+# every redraw. Cleared by the property updates below, renames of objects, actions
+# and bones and mode switches (msgbus), undo and file loads; the panel then
+# validates once on its next draw.
+_smart_bone_states = {}
+
+def invalidate_smart_bone_state(*args):
+    _smart_bone_states.clear()
+
+class SmartBoneInputs:
+    """Validated Smart Bone panel inputs of one scene"""
+
+    def __init__(self, scene):
+        tool = scene.smart_bone_tool
+        self.armature = None            # armature object for the control bone search
+        self.armature_error = ""
+        self.space_armature = None      # space object, when it is an armature
+        self.action = None
+        self.errors = []                # one row each under the inputs
+        self.missing = False            # a name didn't resolve; it may still be added
+        if not tool.armature_name:
+            self.armature_error = "No selected Object"
+        else:
+            target = scene.objects.get(tool.armature_name)
+            if target is None:
+                self.armature_error = f"'{tool.armature_name}' not found"
+                self.missing = True
+            elif target.type != "ARMATURE":
+                self.armature_error = "Object Type = " + target.type
+            else:
+                self.armature = target
+        if self.armature is not None and tool.control_name and tool.control_name not in self.armature.data.bones:
+            self.errors.append(f"Control '{tool.control_name}' not found")
+            self.missing = True
+        if tool.target_space == "CUSTOM":
+            space_object = bpy.data.objects.get(tool.space_object_name)
+            if space_object is not None and space_object.type == "ARMATURE":
+                self.space_armature = space_object
+            elif space_object is None:
+                self.errors.append(f"Space object '{tool.space_object_name}' not found"
+                                   if tool.space_object_name else "No space object")
+                self.missing = bool(self.missing or tool.space_object_name)
+        if tool.action_name:
+            self.action = bpy.data.actions.get(tool.action_name)
+            if self.action is None:
+                self.errors.append(f"Action '{tool.action_name}' not found")
+                self.missing = True
+        self.valid = (self.armature is not None and tool.control_name != "" and self.action is not None
+                      and not self.errors)
+
+    def alive(self):
+        # held objects raise once they have been deleted
+        try:
+            for datablock in (self.armature, self.space_armature, self.action):
+                if datablock is not None:
+                    datablock.name
+        except ReferenceError:
+            return False
+        return True
+
+def smart_bone_state(scene):
+    state = _smart_bone_states.get(scene.as_pointer())
+    if state is None or state.missing or not state.alive():
+        state = _smart_bone_states[scene.as_pointer()] = SmartBoneInputs(scene)
+    return state
+
+# Pose bones each action keys, in the order first keyed. Built once per action and
+# dropped when the depsgraph reports the action changed, a bone is renamed or an
+# F-curve path edited (msgbus, as those don't tag the action), or the F-curve
+# count changes.
+_action_bone_index = {}
+POSE_BONE_PATH = re.compile(r'pose\.bones\["((?:[^"\\]|\\.)*)"\]')
+
+def action_bones(action):
+    key = action.as_pointer()
+    fcurves = action.fcurves
+    entry = _action_bone_index.get(key)
+    if entry is None or entry[0] != len(fcurves):
+        matches = (POSE_BONE_PATH.search(fcurve.data_path) for fcurve in fcurves)
+        bones = dict.fromkeys(bpy.utils.unescape_identifier(match.group(1)) for match in matches if match)
+        entry = _action_bone_index[key] = (len(fcurves), tuple(bones))
+    return entry[1]
+
+class SmartBoneProperties(bpy.types.PropertyGroup):
+    
+    # Original properties...
+    armature_name : bpy.props.StringProperty(
+        name = "Target",
+        description = "Control Armature",
+        update = invalidate_smart_bone_state
+    )
+    
+    control_name : bpy.props.StringProperty(
+        name = "Control",
+        description = "Control Bone",
+        update = invalidate_smart_bone_state
+    )
+    
+    transform_channel : bpy.props.EnumProperty(
+        name = "Channel",
+        description = "Control Axis",
+        items = [
+                ('LOCATION_X', 'LOCATION_X',""),
+                ('LOCATION_Y', 'LOCATION_Y',""),
+                ('LOCATION_Z', 'LOCATION_Z',""),
+                ('ROTATION_X', 'ROTATION_X',""),
+                ('ROTATION_Y', 'ROTATION_Y',""),
+                ('ROTATION_Z', 'ROTATION_Z',""),
+                ('SCALE_X', 'SCALE_X',""),
+                ('SCALE_Y', 'SCALE_Y',""),
+                ('SCALE_Z', 'SCALE_Z',""),   
+            ],
+        default = 'LOCATION_X'
+    )
+    
+    target_space : bpy.props.EnumProperty(
+        name = "Space",
+        description = "Transform Space",
+        items =[
+            ('WORLD', 'WORLD', ""),
+            ('CUSTOM', 'CUSTOM', ""),
+            ('LOCAL', 'LOCAL', "")
+        ],
+        default = 'LOCAL',
+        update = invalidate_smart_bone_state
+            
+    )
+    
+    space_object_name : bpy.props.StringProperty(
+        name = "Space Object",
+        description = "Takes local space from another object, to apply to constraint",
+        default = "",
+        update = invalidate_smart_bone_state
+    )
+    
+    space_subtarget : bpy.props.StringProperty(
+        name = "Space Subtarget",
+        description = "Custom space target, if 'Space Object' is of type ARMATURE",
+        default = "",
+    )
+    
+    transform_min : bpy.props.FloatProperty(
+    name = "Min Transform Range",
+    description = "Minimum Transform Value",
+    default = 0.0,
+    )
+    
+    transform_max : bpy.props.FloatProperty(
+    name = "Max Transform Range",
+    description = "Maximum Transform Value",
+    default = 1.0,
+    )
+    
+    action_bones_filter : bpy.props.StringProperty(
+        name = "Filter",
+        description = "Only list actions or bones whose name contains this",
+        options = {'TEXTEDIT_UPDATE'}
+    )
+    
+    action_name : bpy.props.StringProperty(
+    name = "Action",
+    description = "Name of affected action",
+    update = invalidate_smart_bone_state
+    )
+    
+    frame_min : bpy.props.IntProperty(
+    name = "Min Frame",
+    description = "Start Frame of Action",
+    default = 0,
+    )
+    
+    frame_max : bpy.props.IntProperty(
+    name = "Max Frame",
+    description = "End Frame of Action",
+    default = 20,
+    )
+
+    # New properties for Bendy Body Parts
+    lattice_resolution : bpy.props.IntProperty(
+        name = "Lattice Resolution",
+        description = "Resolution in W direction for lattice",
+        default = 64,
+        min = 1,
+        max = 64
+    )
+
+    use_bendy_lod : bpy.props.BoolProperty(
+        name = "Playback LOD",
+        description = "Lower lattice and B-Bone resolution of bendy parts while playing or scrubbing",
+        default = False
+    )
+
+    bendy_lod_points : bpy.props.IntProperty(
+        name = "LOD Points",
+        description = "Lattice W points of bendy parts during playback",
+        default = 8,
+        min = 2,
+        max = 64
+    )
+
+    bendy_lod_segments : bpy.props.IntProperty(
+        name = "LOD Segments",
+        description = "B-Bone segments of bendy parts during playback",
+        default = 4,
+        min = 1,
+        max = 64
+    )
+
+    use_bendy_bake : bpy.props.BoolProperty(
+        name = "Play Baked",
+        description = "Play back and render bendy parts from their baked positions instead of the live lattice",
+        default = False
+    )
+
+    bendy_bake_dir : bpy.props.StringProperty(
+        name = "Bake Directory",
+        description = "Where baked bendy part positions are kept (next to the .blend file when empty)",
+        subtype = 'DIR_PATH',
+        default = ""
+    )
+
+    bendy_bake_budget : bpy.props.IntProperty(
+        name = "Bake Memory (MB)",
+        description = "Baked positions mapped for playback, parts beyond this keep the live lattice",
+        default = 512,
+        min = 16
+    )
+
+    bendy_bone_count : bpy.props.IntProperty(
+        name = "Bones",
+        description = "Bones in the chain that bends each part",
+        default = 3,
+        min = 1,
+        max = 32
+    )
+
+    bone_segments : bpy.props.IntProperty(
+        name = "Bone Segments",
+        description = "Bendy bone segments",
+        default = 32,
+        min = 1,
+        max = 64
+    )
+
+    exclude_layers : bpy.props.StringProperty(
+        name = "Exclude Layers",
+        description = "Comma-separated layer names to exclude from deformation. Excluding any layer weights every point of the others one by one, which is slow on long drawings",
+        default = ""
+    )
+
+    # New for Better Expressions
+    expression_type : bpy.props.EnumProperty(
+        name = "Expression Type",
+        description = "Type of facial asset",
+        items = [
+            ('EYES', 'Eyes', ""),
+            ('MOUTH', 'Mouth', ""),
+            ('BROWS', 'Brows', "")
+        ],
+        default = 'EYES'
+    )
+
+    num_variations : bpy.props.IntProperty(
+        name = "Number of Variations",
+        description = "Number of expression assets to create",
+        default = 3,
+        min = 1
+    )
+
+    tween_frames : bpy.props.IntProperty(
+        name = "Tween Frames",
+        description = "Frames for tweening between expressions",
+        default = 5,
+        min = 1
+    )
+
+    # New for Some Depth
+    use_depth : bpy.props.BoolProperty(
+        name = "Use Depth",
+        description = "Enable optional depth for selected parts",
+        default = False
+    )
+
+    depth_offset : bpy.props.FloatProperty(
+        name = "Depth Offset",
+        description = "Z-depth offset for parallax",
+        default = 0.0
+    )
+
+    parallax_strength : bpy.props.FloatProperty(
+        name = "Parallax Strength",
+        description = "Strength of parallax effect",
+        default = 1.0
+    )
+
+    # New for Automation
+    preset_type : bpy.props.EnumProperty(
+        name = "Preset",
+        description = "Automation preset",
+        items = [
+            ('ARM_BENDY', 'Arm Bendy', ""),
+            ('LEG_BENDY', 'Leg Bendy', ""),
+            ('FACE_EXPRESSIONS', 'Face Expressions', ""),
+            ('FULL_BODY', 'Full Body Rig', "")
+        ],
+        default = 'ARM_BENDY'
+    )
+
+    # New for Easier Colouring
+    color_palette : CollectionProperty(type=ColorItem)
+
+    fill_type : bpy.props.EnumProperty(
+        name = "Fill Type",
+        description = "Type of colouring",
+        items = [
+            ('FILL', 'Fill', ""),
+            ('SHADE', 'Shade', "")
+        ],
+        default = 'FILL'
+    )
+
+    # New for Auto-layering
+    group_layers : bpy.props.BoolProperty(
+        name = "Group Layers",
+        description = "Link/group layers as Smart Object",
+        default = False
+    )
+
+    linked_group_name : bpy.props.StringProperty(
+        name = "Group Name",
+        description = "Name for linked layer group",
+        default = "SmartGroup"
+    )
+
+    # New for AI Tweening
+    interpolator_type : bpy.props.EnumProperty(
+        name = "Interpolator",
+        description = "Frame interpolation model",
+        items = [
+            ('FILM', 'FILM', ""),
+            ('TOONCRAFTER', 'ToonCrafter', "")
+        ],
+        default = 'FILM'
+    )
+
+    film_path : bpy.props.StringProperty(
+        name = "FILM Path",
+        description = "Path to FILM installation directory",
+        subtype='DIR_PATH',
+        default = ""
+    )
+
+    tooncrafter_path : bpy.props.StringProperty(
+        name = "ToonCrafter Path",
+        description = "Path to ToonCrafter installation directory",
+        subtype='DIR_PATH',
+        default = ""
+    )
+
+    model_path : bpy.props.StringProperty(
+        name = "Model Path",
+        description = "Path to pre-trained model (FILM: saved_model dir, ToonCrafter: model.ckpt)",
+        subtype='FILE_PATH',
+        default = ""
+    )
+
+    ai_prompt : bpy.props.StringProperty(
+        name = "AI Prompt",
+        description = "Prompt for generative interpolation (used in ToonCrafter)",
+        default = "a cartoon animation"
+    )
+
+    ai_times_to_interpolate : bpy.props.IntProperty(
+        name = "AI Interpolations",
+        description = "Number of intermediate frames to generate",
+        default = 1,
+        min = 1
+    )
+
+    ai_preset : bpy.props.EnumProperty(
+        name = "Quality",
+        description = "Speed/quality preset for AI tweening",
+        items = [
+            ('DRAFT', 'Draft', "Few diffusion steps at half resolution on half the cores, reduced precision"),
+            ('PREVIEW', 'Preview', "Moderate steps at three-quarter resolution on three quarters of the cores, reduced precision"),
+            ('FINAL', 'Final', "Full steps, resolution and precision on every core")
+        ],
+        default = 'PREVIEW'
+    )
+
+    ai_crop_to_bounds : bpy.props.BoolProperty(
+        name = "Crop to Bounds",
+        description = "Only send the region the keyframes cover to the model and paste the result back",
+        default = True
+    )
+
+    ai_crop_margin : bpy.props.FloatProperty(
+        name = "Crop Margin",
+        description = "Extra space around the keyframes' bounds, relative to their size",
+        default = 0.1,
+        min = 0.0,
+        max = 1.0
+    )
+
+    ai_batch_size : bpy.props.IntProperty(
+        name = "Batch Size",
+        description = "Keyframe pairs ToonCrafter processes together in whole-shot mode",
+        default = 4,
+        min = 1
+    )
+
+    use_ai_worker : bpy.props.BoolProperty(
+        name = "Keep Model Loaded",
+        description = "Serve AI tweens from a background process that loads the model once",
+        default = True
+    )
+
+    ai_worker_idle_timeout : bpy.props.IntProperty(
+        name = "Worker Idle Timeout",
+        description = "Seconds without requests before the model process exits",
+        default = 600,
+        min = 10
+    )
+
+    ai_wheelhouse : bpy.props.StringProperty(
+        name = "Wheelhouse",
+        description = "Offline install: folder of wheels, plus mirrors of the FILM and ToonCrafter repositories",
+        subtype = 'DIR_PATH',
+        default = ""
+    )
+
+    ai_cpu_mode : bpy.props.BoolProperty(
+        name = "CPU Mode",
+        description = "Run the model process on the CPU with tuned threading instead of the backend defaults",
+        default = False
+    )
+
+    ai_cpu_threads : bpy.props.IntProperty(
+        name = "Intra-op Threads",
+        description = "Threads used inside one operation, 0 for the quality preset's share of the pinned cores",
+        default = 0,
+        min = 0
+    )
+
+    ai_cpu_interop_threads : bpy.props.IntProperty(
+        name = "Inter-op Threads",
+        description = "Operations run concurrently, 0 for the backend default",
+        default = 1,
+        min = 0
+    )
+
+    ai_cpu_cores : bpy.props.StringProperty(
+        name = "Cores",
+        description = "Cores the model process is pinned to, e.g. 2-7 or 0,2,4 (empty for no pinning)",
+        default = ""
+    )
+
+    ai_cpu_quantize : bpy.props.BoolProperty(
+        name = "Dynamic Quantization",
+        description = "Run ToonCrafter linear layers in int8 on the CPU",
+        default = False
+    )
+
+    ai_debug_frames : bpy.props.BoolProperty(
+        name = "Write Debug PNGs",
+        description = "Also save the AI input frames as PNG files in the job directory",
+        default = False
+    )
+
+    ai_workspace_dir : bpy.props.StringProperty(
+        name = "Workspace",
+        description = "Scratch directory for AI tween jobs and results (system temp directory when empty)",
+        subtype = 'DIR_PATH',
+        default = ""
+    )
+
+    ai_workspace_ram : bpy.props.BoolProperty(
+        name = "Use RAM Disk",
+        description = "Keep the default workspace on /dev/shm where available",
+        default = False
+    )
+
+    ai_workspace_quota : bpy.props.IntProperty(
+        name = "Workspace Quota (MB)",
+        description = "Oldest unused job files and results are removed beyond this size",
+        default = 4096,
+        min = 64
+    )
+
+    ai_workspace_max_age : bpy.props.IntProperty(
+        name = "Max Age (hours)",
+        description = "Unused job files and results older than this are removed",
+        default = 24,
+        min = 1
+    )
+
+    use_ai_cache : bpy.props.BoolProperty(
+        name = "Cache Results",
+        description = "Reuse earlier AI tweens of identical frames and settings",
+        default = True
+    )
+
+    ai_cache_dir : bpy.props.StringProperty(
+        name = "Cache Directory",
+        description = "Where cached AI tweens are kept (inside the workspace when empty)",
+        subtype = 'DIR_PATH',
+        default = ""
+    )
+
+    ai_cache_budget : bpy.props.IntProperty(
+        name = "Cache Size (MB)",
+        description = "Least recently used results are removed beyond this size",
+        default = 2048,
+        min = 64
+    )
+
+    ai_playback_mode : bpy.props.EnumProperty(
+        name = "Playback",
+        description = "How imported AI tweens are shown on the timeline",
+        items = [
+            ('DISK', 'Disk', "Image sequence read from disk on every frame change"),
+            ('MEMORY', 'Memory', "Frames decoded once into a memory cache"),
+            ('PACKED', 'Packed', "One image per frame packed into the .blend file")
+        ],
+        default = 'MEMORY'
+    )
+
+    ai_playback_budget : bpy.props.IntProperty(
+        name = "Playback Memory (MB)",
+        description = "Decoded frames kept for scrubbing, least recently shown are dropped beyond this",
+        default = 1024,
+        min = 16
+    )
+
+    ai_playback_low_memory : bpy.props.BoolProperty(
+        name = "Drop on Low Memory",
+        description = "Free decoded frames and read from disk while system memory is low",
+        default = True
+    )
+
+    ai_playback_min_free : bpy.props.IntProperty(
+        name = "Minimum Free (MB)",
+        description = "System memory below which decoded frames are dropped",
+        default = 1024,
+        min = 0
+    )
+
+#---------------------------------------------------------------------
+#    Operators
+#---------------------------------------------------------------------
+
+# Original operators...
+class POSE_OT_AddSmartBone(bpy.types.Operator):
+    """Add action constraints to all bones in action"""
+    bl_idname = "myops.add_smart_bone"
+    bl_label = "Add Smart Bone"
+    
+    
+    def execute(self, context):
+        
+        current_object = bpy.context.object
+        
+        smart_bone_tool = context.scene.smart_bone_tool
+        
+        state = SmartBoneInputs(context.scene)
+        if not state.valid:
+            self.report({'ERROR'}, state.armature_error or (state.errors + ["Invalid Inputs"])[0])
+            return {'CANCELLED'}
+        
+        #Find Action Bones
+        action = state.action
+        action_bones = self.find_action_bones(action)
+        
+            
+        #make all bone layers visible
+        current_selection = []
+        obj = context.scene.objects[smart_bone_tool.armature_name]
+        if obj.type == "ARMATURE":
+            armature_data = obj.data
+        
+        
+        #Add final constraints
+        self.add_action_constraint(
+            current_object,
+            smart_bone_tool.armature_name,
+            action_bones,
+            smart_bone_tool.control_name,
+            smart_bone_tool.transform_channel,
+            smart_bone_tool.target_space,
+            smart_bone_tool.space_object_name,
+            smart_bone_tool.space_subtarget,
+            [smart_bone_tool.transform_min, smart_bone_tool.transform_max],
+            smart_bone_tool.action_name,
+            [smart_bone_tool.frame_min, smart_bone_tool.frame_max],
+        )
+
+
+        return ({'FINISHED'})
+    
+    def find_action_bones(self, action):                                        # create a list of bones used in the action in armature
+        
+        return list(action_bones(action))                                       # indexed once per action, see action_bones()
+    
+    
+    def add_action_constraint(self, current_object, ctrl_armature_name, action_bones, control_name, transform_channel, target_space, space_obj, space_sub, transform_range, action_name, frame_range):
+        
+        
+        if current_object.type == 'ARMATURE':
+            
+            #enter pose mode
+            bpy.ops.object.mode_set(mode='POSE')
+        
+            #stores list of bones as string, to check if affected bone is in current object
+            bones_in_current_obj = []
+            for i in current_object.pose.bones:
+              bones_in_current_obj.append(i.name)
+            
+            
+            for action_bone in action_bones:
+                    
+                    #Prevents trying to add constraint to bone in another armature
+                    if action_bone in bones_in_current_obj:
+                    
+                        current_bone = current_object.pose.bones[action_bone]
+                    
+                        if bpy.data.objects[ctrl_armature_name].pose.bones[control_name] != current_bone: #prevents adding a constraint to a bone, targeting its self
+                    
+                            constraint_name = str("SB_"+control_name+"_"+action_name)
+                            
+                            constraint_exists = False
+                            # Test if bone constraint already exists
+                            for constraint in current_bone.constraints:
+                                if constraint.name == constraint_name:
+                                    constraint_exists = True
+                            
+                            if constraint_exists == False:
+                                constraint = current_bone.constraints.new("ACTION")
+                                constraint.name = constraint_name
+                            
+                            constraint.target = bpy.data.objects[ctrl_armature_name]
+                            constraint.subtarget = control_name
+                            constraint.transform_channel = transform_channel
+                            constraint.target_space = target_space
+                            
+                            if target_space == "CUSTOM":
+                                try:
+                                    constraint.space_object = bpy.data.objects[space_obj]
+                                    
+                                    if space_obj != "" and bpy.context.objects[space_obj].type == "ARMATURE":
+                                        constraint.space_subtarget = space_sub
+                                        
+                                except:
+                                    constraint.target_space = "LOCAL"
+                                    
+                            constraint.min = transform_range[0]
+                            constraint.max = transform_range[1]
+                            constraint.action = bpy.data.actions[action_name]
+                            constraint.frame_start = frame_range[0]
+                            constraint.frame_end = frame_range[1]
+
+
+class POSE_OT_DeleteSmartBone(bpy.types.Operator):
+    """Delete relevant action constraints within selected armature"""
+    
+    bl_idname = "myops.delete_smart_bone"
+    bl_label = "Delete Smart Bone"
+    
+    
+    def execute(self, context):
+        
+        current_armature = bpy.context.object
+        
+        if current_armature.type == "ARMATURE":
+            
+            smart_bone_tool = context.scene.smart_bone_tool
+            
+            armature_name = smart_bone_tool.armature_name
+            control_name = smart_bone_tool.control_name
+            action_name = smart_bone_tool.action_name
+            
+            constraint_name = str("SB_"+control_name+"_"+action_name)
+            
+            bpy.ops.object.mode_set(mode='POSE')
+        
+            #select all the bones in armature
+                
+            bpy.ops.object.mode_set(mode='EDIT')
+            bpy.ops.armature.select_all(action='DESELECT')
+            
+            #make all bone layers visible
+            current_selection = []
+            obj = context.scene.objects[smart_bone_tool.armature_name]
+            if obj.type == "ARMATURE":
+                armature_data = obj.data
+                
+                    
+            
+            for bone in current_armature.data.edit_bones:
+                bone.select = True
+            
+            #remove_constraints
+            for bone in current_armature.pose.bones:
+                for constraint in bone.constraints:
+                    if constraint_name in constraint.name:
+                        bone.constraints.remove(constraint)
+            
+            bpy.ops.object.mode_set(mode='POSE')
+            
+            return {'FINISHED'}
+
+# New Operator for Installing AI Dependencies
+class POSE_OT_InstallAIDeps(bpy.types.Operator):
+    """Install AI dependencies for FILM and ToonCrafter, skipping steps that are already done"""
+    bl_idname = "myops.install_ai_deps"
+    bl_label = "Install AI Deps"
+
+    def execute(self, context):
+        from . import installer
+        return installer.install_execute(self, context)
+
+    def invoke(self, context, event):
+        from . import installer
+        return installer.install_invoke(self, context, event)
+
+    def modal(self, context, event):
+        from . import installer
+        return installer.install_modal(self, context, event)
+
+class POSE_OT_GPInterpolate(bpy.types.Operator):
+    """Interpolate Grease Pencil frames with AI option (overrides built-in)"""
+    bl_idname = "gpencil.interpolate_sequence"
+    bl_label = "Interpolate"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    type : bpy.props.EnumProperty(
+        name = "Type",
+        description = "Interpolation type",
+        items = [
+            ('LINEAR', 'Linear', ''),
+            ('BEZIER', 'Bezier', ''),
+            ('SINE', 'Sinusoidal', ''),
+            ('QUAD', 'Quadratic', ''),
+            ('CUBIC', 'Cubic', ''),
+            ('QUART', 'Quartic', ''),
+            ('QUINT', 'Quintic', ''),
+            ('AI', 'AI Tweening', '')
+        ],
+        default = 'LINEAR'
+    )
+
+    easing : bpy.props.EnumProperty(
+        name = "Easing",
+        description = "Which ends of the segment the easing applies to",
+        items = [
+            ('AUTO', 'Automatic Easing', ''),
+            ('EASE_IN', 'Ease In', ''),
+            ('EASE_OUT', 'Ease Out', ''),
+            ('EASE_IN_OUT', 'Ease In and Out', '')
+        ],
+        default = 'AUTO'
+    )
+
+    steps : bpy.props.IntProperty(
+        name = "Steps",
+        description = "Number of steps",
+        default = 1,
+        min = 1
+    )
+
+    batch : bpy.props.BoolProperty(
+        name = "All Keyframes",
+        description = "Fill every gap between adjacent keyframes on all selected layers",
+        default = False
+    )
+
+    exclude_breakdowns : bpy.props.BoolProperty(
+        name = "Exclude Breakdowns",
+        description = "Interpolate through breakdown frames instead of keeping them as extremes",
+        default = False
+    )
+
+    def execute(self, context):
+        from . import interpolation
+        return interpolation.interpolate(self, context)
+
+class POSE_OT_BenchmarkGPInterpolate(bpy.types.Operator):
+    """Measure stroke interpolation throughput between the first two keyframes of the active layer"""
+    bl_idname = "myops.benchmark_gp_interpolate"
+    bl_label = "Benchmark Interpolation"
+
+    steps : bpy.props.IntProperty(
+        name = "Steps",
+        description = "In-betweens generated per run",
+        default = 8,
+        min = 1
+    )
+
+    repeats : bpy.props.IntProperty(
+        name = "Repeats",
+        description = "Number of timed runs",
+        default = 5,
+        min = 1
+    )
+
+    def execute(self, context):
+        from . import interpolation
+        return interpolation.benchmark(self, context)
+
+class POSE_OT_AddBendyPart(bpy.types.Operator):
+    """Add lattice-based bendy deformation to selected GP part"""
+    bl_idname = "myops.add_bendy_part"
+    bl_label = "Add Bendy Part"
+
+    batch : bpy.props.BoolProperty(
+        name = "All Selected",
+        description = "Rig every selected Grease Pencil part on one shared armature",
+        default = False
+    )
+
+    def execute(self, context):
+        from . import rigging
+        return rigging.add_bendy_part(self, context)
+
+class POSE_OT_BakeBendyParts(bpy.types.Operator):
+    """Bake the deformed strokes of the selected bendy parts over the scene range"""
+    bl_idname = "myops.bake_bendy_parts"
+    bl_label = "Bake Bendy Parts"
+
+    def execute(self, context):
+        from . import rigging
+        return rigging.bake_bendy_parts(self, context)
+
+class POSE_OT_ClearBendyBake(bpy.types.Operator):
+    """Delete the bakes of the selected bendy parts"""
+    bl_idname = "myops.clear_bendy_bake"
+    bl_label = "Clear Bendy Bake"
+
+    def execute(self, context):
+        from . import rigging
+        return rigging.clear_bendy_bake(self, context)
+
+class POSE_OT_AddExpressionAssets(bpy.types.Operator):
+    """Add assets for better facial expressions with tweening"""
+    bl_idname = "myops.add_expression_assets"
+    bl_label = "Add Expression Assets"
+
+    def execute(self, context):
+        obj = context.object
+        if obj.type != 'GPENCIL':
+            self.report({'ERROR'}, "Select a Grease Pencil object")
+            return {'CANCELLED'}
+
+        tool = context.scene.smart_bone_tool
+        gp = obj.data
+
+        new_layers = []
+        for i in range(tool.num_variations):
+            layer_name = f"{tool.expression_type}_{i+1}"
+            layer = gp.layers.new(name=layer_name, set_active=True)
+            new_layers.append(layer)
+            # Add placeholder stroke (simple circle for eyes/mouth)
+            frame = layer.frames.new(context.scene.frame_current)
+            stroke = frame.strokes.new()
+            stroke.points.add(4)
+            stroke.points[0].co = (-0.1, 0, 0)
+            stroke.points[1].co = (0, 0.1, 0)
+            stroke.points[2].co = (0.1, 0, 0)
+            stroke.points[3].co = (0, -0.1, 0)
+
+        # Setup tweening via shape keys or interpolate
+        # For simplicity, add action for blending visibility
+        if not gp.animation_data:
+            gp.animation_data_create()
+        action = bpy.data.actions.new("Expressions")
+        gp.animation_data.action = action
+        # Keyframe visibility for layers
+        for layer in gp.layers:
+            layer.hide = True
+            layer.keyframe_insert(data_path="hide", frame=1)
+        new_layers[0].hide = False
+        new_layers[0].keyframe_insert(data_path="hide", frame=1)
+
+        # Tween: Use interpolate for transitions
+        context.scene.frame_set(1)
+        bpy.ops.gpencil.interpolate_sequence(steps=tool.tween_frames)
+
+        return {'FINISHED'}
+
+class POSE_OT_AddDepth(bpy.types.Operator):
+    """Add optional depth to selected parts"""
+    bl_idname = "myops.add_depth"
+    bl_label = "Add Depth"
+
+    def execute(self, context):
+        obj = context.object
+        tool = context.scene.smart_bone_tool
+
+        if tool.use_depth:
+            if obj.type == 'GPENCIL':
+                active_layer = obj.data.layers.active
+                if active_layer:
+                    # Offset layer z, but GP layers have no z, so object
+                    obj.location.z += tool.depth_offset
+            else:
+                obj.location.z += tool.depth_offset
+
+            # Parallax: Simple driver on object
+            if bpy.context.scene.camera:
+                driver = obj.driver_add("location", 2)  # Z
+                driver.driver.type = 'SCRIPTED'
+                driver.driver.expression = f"frame * {tool.parallax_strength / 100}"
+
+        return {'FINISHED'}
+
+class POSE_OT_ApplyPreset(bpy.types.Operator):
+    """Apply automation preset"""
+    bl_idname = "myops.apply_preset"
+    bl_label = "Apply Preset"
+
+    def execute(self, context):
+        tool = context.scene.smart_bone_tool
+        preset = tool.preset_type
+
+        if preset == 'ARM_BENDY' or preset == 'LEG_BENDY':
+            bpy.ops.myops.add_bendy_part()
+        elif preset == 'FACE_EXPRESSIONS':
+            bpy.ops.myops.add_expression_assets()
+        elif preset == 'FULL_BODY':
+            # Automate full body rig: add bendy for arms, legs, expressions, depth
+            bpy.ops.myops.add_bendy_part()  # Assume for arm
+            tool.expression_type = 'EYES'
+            bpy.ops.myops.add_expression_assets()
+            tool.expression_type = 'MOUTH'
+            bpy.ops.myops.add_expression_assets()
+            tool.use_depth = True
+            bpy.ops.myops.add_depth()
+
+        return {'FINISHED'}
+
+class POSE_OT_AddColor(bpy.types.Operator):
+    """Add a color to the palette"""
+    bl_idname = "myops.add_color"
+    bl_label = "Add Color"
+
+    def execute(self, context):
+        from . import colouring
+        return colouring.add_color(self, context)
+
+class POSE_OT_EasyColour(bpy.types.Operator):
+    """One-click colouring for GP objects"""
+    bl_idname = "myops.easy_colour"
+    bl_label = "Easy Colour"
+
+    def execute(self, context):
+        from . import colouring
+        return colouring.easy_colour(self, context)
+
+class POSE_OT_EditGroup(bpy.types.Operator):
+    """Edit linked layer group"""
+    bl_idname = "myops.edit_group"
+    bl_label = "Edit Group"
+
+    def execute(self, context):
+        from . import colouring
+        return colouring.edit_group(self, context)
+
+class POSE_OT_AITween(bpy.types.Operator):
+    """Experimental AI tweening using FILM or ToonCrafter"""
+    bl_idname = "myops.ai_tween"
+    bl_label = "Interpolate with AI"
+
+    shot : bpy.props.BoolProperty(
+        name = "Whole Shot",
+        description = "Tween every keyframe pair of the active object in one backend run",
+        default = False
+    )
+
+    exclude_breakdowns : bpy.props.BoolProperty(
+        name = "Exclude Breakdowns",
+        description = "Interpolate through breakdown frames instead of keeping them as extremes",
+        default = False
+    )
+
+    def execute(self, context):
+        from . import ai
+        return ai.tween_execute(self, context)
+
+    def invoke(self, context, event):
+        from . import ai
+        return ai.tween_invoke(self, context, event)
+
+    def modal(self, context, event):
+        from . import ai
+        return ai.tween_modal(self, context, event)
+
+class POSE_OT_BenchmarkAICPU(bpy.types.Operator):
+    """Time one AI tween of the current frame pair on the CPU, changing one setting per run"""
+    bl_idname = "myops.benchmark_ai_cpu"
+    bl_label = "Benchmark CPU Mode"
+
+    def execute(self, context):
+        from . import ai
+        return ai.benchmark_execute(self, context)
+
+    def invoke(self, context, event):
+        from . import ai
+        return ai.benchmark_invoke(self, context, event)
+
+    def modal(self, context, event):
+        from . import ai
+        return ai.benchmark_modal(self, context, event)
+
+class POSE_OT_ClearAICache(bpy.types.Operator):
+    """Remove cached AI tweens that are not used in the scene"""
+    bl_idname = "myops.clear_ai_cache"
+    bl_label = "Clear AI Cache"
+
+    def execute(self, context):
+        from . import ai
+        return ai.clear_cache(self, context)
+
+class POSE_OT_FreeAIPlaybackCache(bpy.types.Operator):
+    """Free decoded AI tween frames; they are read from disk again when shown"""
+    bl_idname = "myops.free_ai_playback_cache"
+    bl_label = "Free Playback Memory"
+
+    def execute(self, context):
+        from . import ai
+        return ai.free_playback(self, context)
+
+class POSE_OT_CleanAIWorkspace(bpy.types.Operator):
+    """Remove expired AI tween scratch files and results not used in the scene"""
+    bl_idname = "myops.clean_ai_workspace"
+    bl_label = "Clean AI Workspace"
+
+    def execute(self, context):
+        from . import ai
+        return ai.clean_workspace(self, context)
+
+class POSE_OT_AITweenCancel(bpy.types.Operator):
+    """Cancel a queued or running AI tween"""
+    bl_idname = "myops.ai_tween_cancel"
+    bl_label = "Cancel AI Tween"
+
+    job_id : bpy.props.IntProperty()
+
+    def execute(self, context):
+        from . import ai
+        return ai.cancel_job(self, context)
+
+#---------------------------------------------------------------------
+#    Panels
+#---------------------------------------------------------------------
+
+class POSE_PT_SmartBonePanel(bpy.types.Panel):
+    bl_label = "Smart Bone Panel"
+    bl_idname = "POSE_PT_SmartBonePanel"
+    bl_space_type = "DOPESHEET_EDITOR"   
+    bl_region_type = "UI"
+    bl_category = "Animation"
+    #bl_context = "posemode"   
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+        smart_bone_tool = scene.smart_bone_tool
+        state = smart_bone_state(scene)
+        
+        #properties
+        
+        row = layout.row()
+        
+        row = layout.row()
+        row.prop_search(smart_bone_tool, "armature_name", scene, "objects")
+        
+        row = layout.row()
+        if state.armature is not None:
+            row.prop_search(smart_bone_tool, "control_name", state.armature.data, "bones")
+        else:
+            row.label(text = state.armature_error, icon = "ERROR")
+        
+        row = layout.row()
+        row.prop(smart_bone_tool, "transform_channel")
+        row = layout.row()
+        row.prop(smart_bone_tool, "target_space")
+        
+        row = layout.row()
+        if smart_bone_tool.target_space == "CUSTOM":
+            row.prop_search(smart_bone_tool, "space_object_name", scene, "objects")
+            
+            if state.space_armature is not None:
+                row = layout.row()
+                row.prop_search(smart_bone_tool, "space_subtarget", state.space_armature.data, "bones")
+
+        row = layout.row()
+        row.label(text = 'Transform Range')
+        row = layout.row()
+        row.prop(smart_bone_tool, "transform_min", text="min")
+        row.prop(smart_bone_tool, "transform_max", text="max")
+        
+        row = layout.row()
+        layout.prop_search(smart_bone_tool, "action_name", bpy.data, "actions")
+        row = layout.row()
+        row.label(text = 'Frame Range')
+        row = layout.row()
+        row.prop(smart_bone_tool, "frame_min", text="min")
+        row.prop(smart_bone_tool, "frame_max", text="max")
+        
+        #operator
+        
+        if state.valid:
+            
+            layout.row()
+            layout.row().label(text = 'Operators')
+            layout.operator("myops.add_smart_bone")
+            layout.row()
+            layout.operator("myops.delete_smart_bone")
+            
+            layout.separator()
+        else:
+            layout.row()
+            for error in state.errors:
+                layout.row().label(text = error, icon = "ERROR")
+            layout.row().label(text = 'Invalid Inputs', icon = "ERROR")
+
+# New Subpanels
+class POSE_PT_ActionBonesPanel(bpy.types.Panel):
+    bl_label = "Action Bones"
+    bl_idname = "POSE_PT_ActionBonesPanel"
+    bl_space_type = "DOPESHEET_EDITOR"
+    bl_region_type = "UI"
+    bl_category = "Animation"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        tool = context.scene.smart_bone_tool
+        layout.prop(tool, "action_bones_filter", text="", icon='VIEWZOOM')
+        search = tool.action_bones_filter.lower()
+        for action in bpy.data.actions:
+            bones = action_bones(action)
+            if search and search not in action.name.lower():
+                bones = [bone for bone in bones if search in bone.lower()]
+                if not bones:
+                    continue
+            box = layout.box()
+            icon = 'CHECKMARK' if action.name == tool.action_name else 'ACTION'
+            box.label(text=f"{action.name} ({len(bones)} bone{'s' if len(bones) != 1 else ''})", icon=icon)
+            col = box.column(align=True)
+            for i in range(0, len(bones), 3):
+                col.label(text=", ".join(bones[i:i + 3]))
+
+class POSE_PT_BendyPanel(bpy.types.Panel):
+    bl_label = "Bendy Body Parts"
+    bl_idname = "POSE_PT_BendyPanel"
+    bl_space_type = "DOPESHEET_EDITOR"
+    bl_region_type = "UI"
+    bl_category = "Animation"
+
+    def draw(self, context):
+        layout = self.layout
+        tool = context.scene.smart_bone_tool
+        layout.prop(tool, "lattice_resolution")
+        layout.prop(tool, "bendy_bone_count")
+        layout.prop(tool, "bone_segments")
+        layout.prop(tool, "exclude_layers")
+        row = layout.row()
+        row.operator("myops.add_bendy_part")
+        row.operator("myops.add_bendy_part", text="Rig Selected").batch = True
+        layout.prop(tool, "use_bendy_lod")
+        if tool.use_bendy_lod:
+            row = layout.row()
+            row.prop(tool, "bendy_lod_points")
+            row.prop(tool, "bendy_lod_segments")
+            lattice = bendy_lattice_of(context.object)
+            if lattice is not None:
+                row = layout.row()
+                row.prop(lattice, '["sb_lod_points"]', text="Part Points")
+                row.prop(lattice, '["sb_lod_segments"]', text="Part Segments")
+        layout.prop(tool, "use_bendy_bake")
+        if tool.use_bendy_bake:
+            layout.prop(tool, "bendy_bake_dir")
+            layout.prop(tool, "bendy_bake_budget")
+            row = layout.row()
+            row.operator("myops.bake_bendy_parts")
+            row.operator("myops.clear_bendy_bake", text="Clear")
+            obj = context.object
+            if obj is not None and "sb_bake_offsets" in obj:
+                last = obj["sb_bake_start"] + len(obj["sb_bake_offsets"]) - 2
+                layout.label(text=f"Baked frames {obj['sb_bake_start']}-{last}")
+
+class POSE_PT_ExpressionsPanel(bpy.types.Panel):
+    bl_label = "Better Expressions"
+    bl_idname = "POSE_PT_ExpressionsPanel"
+    bl_space_type = "DOPESHEET_EDITOR"
+    bl_region_type = "UI"
+    bl_category = "Animation"
+
+    def draw(self, context):
+        layout = self.layout
+        tool = context.scene.smart_bone_tool
+        layout.prop(tool, "expression_type")
+        layout.prop(tool, "num_variations")
+        layout.prop(tool, "tween_frames")
+        layout.operator("myops.add_expression_assets")
+
+class POSE_PT_DepthPanel(bpy.types.Panel):
+    bl_label = "Some Depth"
+    bl_idname = "POSE_PT_DepthPanel"
+    bl_space_type = "DOPESHEET_EDITOR"
+    bl_region_type = "UI"
+    bl_category = "Animation"
+
+    def draw(self, context):
+        layout = self.layout
+        tool = context.scene.smart_bone_tool
+        layout.prop(tool, "use_depth")
+        layout.prop(tool, "depth_offset")
+        layout.prop(tool, "parallax_strength")
+        layout.operator("myops.add_depth")
+
+class POSE_PT_AutomationPanel(bpy.types.Panel):
+    bl_label = "Automation"
+    bl_idname = "POSE_PT_AutomationPanel"
+    bl_space_type = "DOPESHEET_EDITOR"
+    bl_region_type = "UI"
+    bl_category = "Animation"
+
+    def draw(self, context):
+        layout = self.layout
+        tool = context.scene.smart_bone_tool
+        layout.prop(tool, "preset_type")
+        layout.operator("myops.apply_preset")
+
+class POSE_PT_ColouringPanel(bpy.types.Panel):
+    bl_label = "Easier Colouring"
+    bl_idname = "POSE_PT_ColouringPanel"
+    bl_space_type = "DOPESHEET_EDITOR"
+    bl_region_type = "UI"
+    bl_category = "Animation"
+
+    def draw(self, context):
+        layout = self.layout
+        tool = context.scene.smart_bone_tool
+        layout.prop(tool, "fill_type")
+        layout.operator("myops.add_color")
+        for item in tool.color_palette:
+            layout.prop(item, "color")
+        layout.operator("myops.easy_colour")
+
+class POSE_PT_LayeringPanel(bpy.types.Panel):
+    bl_label = "Auto-layering"
+    bl_idname = "POSE_PT_LayeringPanel"
+    bl_space_type = "DOPESHEET_EDITOR"
+    bl_region_type = "UI"
+    bl_category = "Animation"
+
+    def draw(self, context):
+        layout = self.layout
+        tool = context.scene.smart_bone_tool
+        layout.prop(tool, "group_layers")
+        layout.prop(tool, "linked_group_name")
+        layout.operator("myops.edit_group")
+
+class POSE_PT_AIPanel(bpy.types.Panel):
+    bl_label = "AI Tweening (Experimental)"
+    bl_idname = "POSE_PT_AIPanel"
+    bl_space_type = "DOPESHEET_EDITOR"
+    bl_region_type = "UI"
+    bl_category = "Animation"
+
+    def draw(self, context):
+        layout = self.layout
+        tool = context.scene.smart_bone_tool
+        row = layout.row()
+        row.prop(tool, "ai_wheelhouse")
+        row.operator("myops.install_ai_deps")
+        layout.prop(tool, "interpolator_type")
+        if tool.interpolator_type == 'FILM':
+            layout.prop(tool, "film_path")
+        elif tool.interpolator_type == 'TOONCRAFTER':
+            layout.prop(tool, "tooncrafter_path")
+            layout.prop(tool, "ai_prompt")
+            layout.prop(tool, "ai_batch_size")
+        layout.prop(tool, "model_path")
+        layout.prop(tool, "ai_times_to_interpolate")
+        layout.row().prop(tool, "ai_preset", expand=True)
+        # run-time state only exists once the AI code has been used
+        ai = loaded_module("ai")
+        if ai:
+            row = layout.row()
+            for preset in ai.AI_PRESETS:
+                total, runs = ai.preset_timings.get((tool.interpolator_type, preset), (0.0, 0))
+                row.label(text=f"{total / runs:.1f} s" if runs else "-")
+        row = layout.row()
+        row.prop(tool, "ai_crop_to_bounds")
+        if tool.ai_crop_to_bounds:
+            row.prop(tool, "ai_crop_margin")
+        layout.prop(tool, "use_ai_worker")
+        if tool.use_ai_worker:
+            layout.prop(tool, "ai_worker_idle_timeout")
+            layout.prop(tool, "ai_debug_frames")
+            layout.prop(tool, "ai_cpu_mode")
+            if tool.ai_cpu_mode:
+                layout.prop(tool, "ai_cpu_threads")
+                layout.prop(tool, "ai_cpu_interop_threads")
+                layout.prop(tool, "ai_cpu_cores")
+                if tool.interpolator_type == 'TOONCRAFTER':
+                    layout.prop(tool, "ai_cpu_quantize")
+            row = layout.row()
+            row.operator("myops.benchmark_ai_cpu")
+            benchmark = ai and ai.cpu_benchmarks.get(tool.interpolator_type)
+            if benchmark:
+                # speedup of each setting on its own
+                for name, seconds, speedup in benchmark[1:]:
+                    row.label(text=f"{name} {speedup:.2f}x")
+        layout.prop(tool, "ai_workspace_dir")
+        if not tool.ai_workspace_dir:
+            layout.prop(tool, "ai_workspace_ram")
+        row = layout.row()
+        row.prop(tool, "ai_workspace_quota")
+        row.prop(tool, "ai_workspace_max_age")
+        layout.operator("myops.clean_ai_workspace")
+        layout.prop(tool, "use_ai_cache")
+        if tool.use_ai_cache:
+            layout.prop(tool, "ai_cache_dir")
+            layout.prop(tool, "ai_cache_budget")
+            row = layout.row()
+            if ai:
+                cache = ai.result_cache
+                row.label(text=f"Hits {cache.hits}/{cache.hits + cache.misses} "
+                               f"({cache.hit_rate:.0%}), {cache.size / 1e6:.0f} MB")
+            row.operator("myops.clear_ai_cache", text="", icon='TRASH')
+        layout.prop(tool, "ai_playback_mode")
+        if tool.ai_playback_mode == 'MEMORY':
+            layout.prop(tool, "ai_playback_budget")
+            row = layout.row()
+            row.prop(tool, "ai_playback_low_memory")
+            if tool.ai_playback_low_memory:
+                row.prop(tool, "ai_playback_min_free")
+            row = layout.row()
+            if ai:
+                frames = ai._playback_frames
+                row.label(text=f"{len(frames)} frames, {sum(cached.nbytes for cached in frames.values()) / 1e6:.0f} MB")
+            row.operator("myops.free_ai_playback_cache", text="", icon='TRASH')
+        row = layout.row()
+        row.operator("myops.ai_tween")
+        row.operator("myops.ai_tween", text="Whole Shot").shot = True
+        for job in ai._ai_jobs if ai else ():
+            row = layout.row()
+            row.label(text=f"{job.label}: {job.stage} ({job.progress:.0%})", icon='TIME')
+            op = row.operator("myops.ai_tween_cancel", text="", icon='X')
+            op.job_id = job.id
+        layout.operator("myops.startup_report")
+
+class POSE_OT_StartupReport(bpy.types.Operator):
+    """Report what loading and registering the add-on cost, and which subsystems are loaded"""
+    bl_idname = "myops.startup_report"
+    bl_label = "Startup Report"
+
+    def execute(self, context):
+        self.report({'INFO'}, startup_report())
+        return {'FINISHED'}
+
+# Menu func for interpolate menu
+def interpolate_menu_func(self, context):
+    self.layout.separator()
+    op = self.layout.operator(POSE_OT_GPInterpolate.bl_idname, text="Interpolate All Keyframes")
+    op.batch = True
+    self.layout.operator(POSE_OT_AITween.bl_idname)
+
+#---------------------------------------------------------------------
+#    Register
+#---------------------------------------------------------------------
+
+blender_classes = [
+    ColorItem,
+    SmartBoneProperties,
+    POSE_OT_AddSmartBone,
+    POSE_OT_DeleteSmartBone,
+    POSE_OT_AddBendyPart,
+    POSE_OT_BakeBendyParts,
+    POSE_OT_ClearBendyBake,
+    POSE_OT_AddExpressionAssets,
+    POSE_OT_AddDepth,
+    POSE_OT_ApplyPreset,
+    POSE_OT_AddColor,
+    POSE_OT_EasyColour,
+    POSE_OT_EditGroup,
+    POSE_OT_AITween,
+    POSE_OT_AITweenCancel,
+    POSE_OT_BenchmarkAICPU,
+    POSE_OT_ClearAICache,
+    POSE_OT_FreeAIPlaybackCache,
+    POSE_OT_CleanAIWorkspace,
+    POSE_OT_InstallAIDeps,
+    POSE_OT_GPInterpolate,
+    POSE_OT_BenchmarkGPInterpolate,
+    POSE_PT_SmartBonePanel,
+    POSE_PT_ActionBonesPanel,
+    POSE_PT_BendyPanel,
+    POSE_PT_ExpressionsPanel,
+    POSE_PT_DepthPanel,
+    POSE_PT_AutomationPanel,
+    POSE_PT_ColouringPanel,
+    POSE_PT_LayeringPanel,
+    POSE_PT_AIPanel,
+    POSE_OT_StartupReport
+]
+
+LAZY_MODULES = ("interpolation", "ai", "installer", "colouring", "rigging")
+
+def loaded_module(name):
+    # the submodule if something already imported it, never importing it here
+    return sys.modules.get(f"{__name__}.{name}")
+
+def startup_report():
+    loaded = [name for name in LAZY_MODULES if loaded_module(name)]
+    return (f"Smart2D import {startup_timings.get('import', 0.0) * 1000:.1f} ms, "
+            f"register {startup_timings.get('register', 0.0) * 1000:.1f} ms; "
+            f"loaded on demand: {', '.join(loaded) or 'none'}")
+
+def bendy_lattice_of(obj):
+    # the lattice bending a part, or the lattice itself
+    if obj is None:
+        return None
+    if obj.type == 'LATTICE':
+        return obj if "sb_full_points" in obj else None
+    if obj.type == 'GPENCIL':
+        for mod in obj.grease_pencil_modifiers:
+            if mod.type == 'GP_LATTICE' and mod.object and "sb_full_points" in mod.object:
+                return mod.object
+    return None
+
+# While any window plays or scrubs, bendy parts drop to their LOD resolution and
+# baked parts play back from their bake; renders keep full resolution
+_bendy_lod_low = False
+_bendy_baked = False
+_bendy_rendering = False
+
+def viewport_playing():
+    wm = bpy.context.window_manager
+    return wm is not None and any(window.screen.is_animation_playing or window.screen.is_scrubbing
+                                  for window in wm.windows)
+
+def switch_bendy_playback(scene, low, baked):
+    global _bendy_lod_low, _bendy_baked
+    from . import rigging
+    if low != _bendy_lod_low:
+        rigging.set_bendy_lod(scene, low)
+    if baked != _bendy_baked:
+        rigging.set_bendy_bake(scene, baked)
+    _bendy_lod_low, _bendy_baked = low, baked
+    if (low or baked) and not bpy.app.timers.is_registered(restore_bendy_playback):
+        bpy.app.timers.register(restore_bendy_playback, first_interval=0.25)
+
+def restore_bendy_playback():
+    # stopping playback or scrubbing fires no handler, so poll while switched
+    if not (_bendy_lod_low or _bendy_baked):
+        return None
+    if _bendy_rendering or viewport_playing():
+        return 0.25
+    switch_bendy_playback(bpy.context.scene, False, False)
+    return None
+
+@bpy.app.handlers.persistent
+def bendy_frame_change(scene, depsgraph=None):
+    tool = scene.smart_bone_tool
+    playing = not _bendy_rendering and viewport_playing()
+    low = tool.use_bendy_lod and playing
+    baked = tool.use_bendy_bake and (playing or _bendy_rendering)
+    if (low, baked) != (_bendy_lod_low, _bendy_baked):
+        switch_bendy_playback(scene, low, baked)
+    if _bendy_baked:
+        from . import rigging
+        rigging.apply_bendy_bake(scene)
+
+@bpy.app.handlers.persistent
+def bendy_render_init(scene, *args):
+    global _bendy_rendering
+    _bendy_rendering = True
+    if _bendy_lod_low:
+        switch_bendy_playback(scene, False, _bendy_baked)
+
+@bpy.app.handlers.persistent
+def bendy_render_done(*args):
+    global _bendy_rendering
+    _bendy_rendering = False
+
+@bpy.app.handlers.persistent
+def bendy_save_pre(*args):
+    # saved files keep full resolution and their own drawings
+    if _bendy_lod_low or _bendy_baked:
+        switch_bendy_playback(bpy.context.scene, False, False)
+
+@bpy.app.handlers.persistent
+def bendy_load_post(*args):
+    # the switched parts belonged to the previous file; bake copies saved shown with
+    # a file during baked playback give their parts back
+    global _bendy_lod_low, _bendy_baked
+    rigging = loaded_module("rigging")
+    if rigging:
+        rigging.forget_bendy_lod()
+        rigging.forget_bendy_bake()
+    if any("sb_bake_proxy" in obj for obj in bpy.data.objects):
+        from . import rigging
+        rigging.hide_bake_proxies()
+    _bendy_lod_low = _bendy_baked = False
+
+BENDY_PLAYBACK_HANDLERS = (
+    ("frame_change_pre", bendy_frame_change),
+    ("render_init", bendy_render_init),
+    ("render_complete", bendy_render_done),
+    ("render_cancel", bendy_render_done),
+    ("save_pre", bendy_save_pre),
+    ("load_post", bendy_load_post),
+)
+
+def bone_renamed(*args):
+    invalidate_smart_bone_state()
+    clear_action_bones()
+
+# owner of the msgbus subscriptions; Blender drops them on file load
+_msgbus_owner = object()
+
+@bpy.app.handlers.persistent
+def watch_smart_bone_inputs(*args):
+    # renamed objects, actions and bones leave stale names in the panel inputs
+    invalidate_smart_bone_state()
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    # bones are renamed or deleted in edit mode, so leaving it revalidates too
+    for key in ((bpy.types.Object, "name"), (bpy.types.Action, "name"), (bpy.types.Object, "mode")):
+        bpy.msgbus.subscribe_rna(key=key, owner=_msgbus_owner, args=(), notify=invalidate_smart_bone_state)
+    # bone renames rewrite F-curve paths without tagging the action
+    bpy.msgbus.subscribe_rna(key=(bpy.types.Bone, "name"), owner=_msgbus_owner, args=(), notify=bone_renamed)
+    bpy.msgbus.subscribe_rna(key=(bpy.types.FCurve, "data_path"), owner=_msgbus_owner, args=(),
+                             notify=clear_action_bones)
+
+@bpy.app.handlers.persistent
+def invalidate_action_bones(scene, depsgraph):
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Action):
+            _action_bone_index.pop(update.id.original.as_pointer(), None)
+
+@bpy.app.handlers.persistent
+def clear_action_bones(*args):
+    _action_bone_index.clear()
+
+ACTION_BONE_HANDLERS = (
+    ("depsgraph_update_post", invalidate_action_bones),
+    ("load_post", clear_action_bones),
+    ("undo_post", clear_action_bones),
+    ("redo_post", clear_action_bones),
+)
+
+@bpy.app.handlers.persistent
+def save_ai_references(*args):
+    # AI tween results the saved file shows are kept out of workspace eviction,
+    # also when its AI empties came from disk and the AI code never loaded
+    if loaded_module("ai") or any("sb_playback" in obj for obj in bpy.data.objects):
+        from . import ai
+        ai.record_references()
+
+@bpy.app.handlers.persistent
+def load_ai_playback(*args):
+    # memory and packed AI tweens need the playback handler; other files never load the AI code
+    ai = loaded_module("ai")
+    if ai:
+        ai.disable_playback()
+    if any("sb_playback" in obj for obj in bpy.data.objects):
+        from . import ai
+        ai.enable_playback()
+        if bpy.context.scene is not None:
+            ai.update_ai_playback(bpy.context.scene)
+
+def register():
+    begin = time.perf_counter()
+    for blender_class in blender_classes:
+        bpy.utils.register_class(blender_class)
+    
+    bpy.types.Scene.smart_bone_tool = bpy.props.PointerProperty(type=SmartBoneProperties)
+    bpy.app.handlers.load_post.append(load_ai_playback)
+    # the open file can't be inspected while add-ons register
+    bpy.app.timers.register(load_ai_playback, first_interval=0.0)
+    watch_smart_bone_inputs()
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.append(watch_smart_bone_inputs)
+    for name, handler in BENDY_PLAYBACK_HANDLERS + ACTION_BONE_HANDLERS:
+        getattr(bpy.app.handlers, name).append(handler)
+    bpy.app.handlers.save_post.append(save_ai_references)
+    try:
+        bpy.types.DOPESHEET_MT_gpencil_frame.append(interpolate_menu_func)
+    except AttributeError:
+        pass
+    try:
+        bpy.types.DOPESHEET_MT_key.append(interpolate_menu_func)
+    except AttributeError:
+        pass
+    startup_timings["register"] = time.perf_counter() - begin
+    if os.environ.get("SMART2D_STARTUP_REPORT"):
+        print(startup_report())
+    
+def unregister():
+    ai = loaded_module("ai")
+    if ai:
+        ai.shutdown_ai_jobs()
+        ai.disable_playback()
+    if bpy.app.timers.is_registered(load_ai_playback):
+        bpy.app.timers.unregister(load_ai_playback)
+    if load_ai_playback in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(load_ai_playback)
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if watch_smart_bone_inputs in handlers:
+            handlers.remove(watch_smart_bone_inputs)
+    for name, handler in BENDY_PLAYBACK_HANDLERS + ACTION_BONE_HANDLERS:
+        handlers = getattr(bpy.app.handlers, name)
+        if handler in handlers:
+            handlers.remove(handler)
+    if save_ai_references in bpy.app.handlers.save_post:
+        bpy.app.handlers.save_post.remove(save_ai_references)
+    if _bendy_lod_low or _bendy_baked:
+        switch_bendy_playback(bpy.context.scene, False, False)
+    if bpy.app.timers.is_registered(restore_bendy_playback):
+        bpy.app.timers.unregister(restore_bendy_playback)
+    invalidate_smart_bone_state()
+    clear_action_bones()
+    for blender_class in blender_classes:
+        bpy.utils.unregister_class(blender_class)
+
+    del bpy.types.Scene.smart_bone_tool
+    try:
+        bpy.types.DOPESHEET_MT_gpencil_frame.remove(interpolate_menu_func)
+    except AttributeError:
+        pass
+    try:
+        bpy.types.DOPESHEET_MT_key.remove(interpolate_menu_func)
+    except AttributeError:
+        pass
+
+startup_timings["import"] = time.perf_counter() - _import_started
+
+if __name__ == "__main__":
+    register()
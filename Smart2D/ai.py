@@ -0,0 +1,1420 @@
+import bpy
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from multiprocessing import shared_memory
+from multiprocessing.connection import Client
+import queue
+import itertools
+import time
+import functools
+import collections
+import hashlib
+import json
+import math
+import shutil
+import numpy as np
+from .interpolation import read_frame_arrays, _ragged_arange, is_extreme
+
+#---------------------------------------------------------------------
+#    Rasterizer
+#---------------------------------------------------------------------
+
+# ToonCrafter is trained at a fixed size, FILM takes the scene resolution
+TOONCRAFTER_RESOLUTION = (512, 320)
+
+# Speed/quality trade-offs for AI tweening. threads is the share of the CPU cores
+# the model process may use; drafts leave half of them to Blender.
+AI_PRESETS = {
+    'DRAFT': {"steps": 10, "scale": 0.5, "threads": 0.5, "precision": 'BF16'},
+    'PREVIEW': {"steps": 25, "scale": 0.75, "threads": 0.75, "precision": 'BF16'},
+    'FINAL': {"steps": 50, "scale": 1.0, "threads": 1.0, "precision": 'FP32'},
+}
+
+def preset_threads(preset, cores=None):
+    cores = cores or os.cpu_count() or 1
+    return max(int(round(cores * AI_PRESETS[preset]["threads"])), 1)
+
+def snap_resolution(width, height, multiple):
+    # both sides on a multiple grid, picked together so the aspect ratio and the
+    # pixel count stay as close to the target as the grid allows
+    aspect = width / height
+    best = None
+    for rows in range(1, max(int(height / multiple) * 2, 2) + 1):
+        cols = max(int(round(rows * aspect)), 1)
+        error = (abs(math.log(cols * rows * multiple * multiple / (width * height)))
+                 + abs(math.log(cols / rows / aspect)))
+        if best is None or error < best[0]:
+            best = (error, cols * multiple, rows * multiple)
+    return best[1], best[2]
+
+def model_resolution(tool, scene):
+    scale = AI_PRESETS[tool.ai_preset]["scale"]
+    if tool.interpolator_type == 'TOONCRAFTER':
+        # the UNet downsamples the latent, keep both sides multiples of 64
+        width, height = TOONCRAFTER_RESOLUTION
+        return snap_resolution(width * scale, height * scale, 64)
+    scale *= scene.render.resolution_percentage / 100
+    return (max(int(scene.render.resolution_x * scale) // 8 * 8, 8),
+            max(int(scene.render.resolution_y * scale) // 8 * 8, 8))
+
+def layer_frame_at(layer, frame_number):
+    # the frame shown at frame_number: last keyframe at or before it
+    shown = None
+    for f in layer.frames:
+        if f.frame_number <= frame_number and (shown is None or f.frame_number > shown.frame_number):
+            shown = f
+    return shown
+
+def gp_world_bounds(obj, frame_numbers):
+    # XY bounds of every visible stroke shown at any of the frames, padded by stroke width
+    pixel_factor = getattr(obj.data, "pixel_factor", 1.0)
+    lower = np.full(2, np.inf)
+    upper = np.full(2, -np.inf)
+    for layer in obj.data.layers:
+        if layer.hide:
+            continue
+        matrix = np.array(obj.matrix_world @ layer.matrix_layer, dtype=np.float32)
+        for frame in {layer_frame_at(layer, frame_number) for frame_number in frame_numbers} - {None}:
+            arrays = read_frame_arrays(frame)
+            if not len(arrays.co):
+                continue
+            world = arrays.co @ matrix[:3, :3].T + matrix[:3, 3]
+            pad = arrays.pressure.max() * arrays.line_width.max() * pixel_factor / 2000.0
+            lower = np.minimum(lower, world[:, :2].min(axis=0) - pad)
+            upper = np.maximum(upper, world[:, :2].max(axis=0) + pad)
+    if not np.isfinite(lower).all():
+        return None
+    return lower, upper
+
+def crop_view(bounds, full_size, model_size=None, margin=0.1, ortho_scale=10.0):
+    # Framing for rasterizing only the animated region of the default full-frame view.
+    # Fixed-size models get the region stretched to their aspect, others keep the
+    # full-frame pixel density so small regions make small inputs.
+    # Returns None when cropping would not save anything.
+    full_width, full_height = full_size
+    pixels_per_unit = max(full_width, full_height) / ortho_scale
+    lower, upper = bounds
+    size = upper - lower
+    size = size + margin * size.max() + 1.0 / pixels_per_unit
+    center = (lower + upper) / 2
+    if model_size:
+        crop_width, crop_height = model_size
+        aspect = crop_width / crop_height
+        size = np.array((max(size[0], size[1] * aspect), max(size[1], size[0] / aspect)))
+    else:
+        crop_width = int(np.ceil(size[0] * pixels_per_unit / 8)) * 8
+        crop_height = int(np.ceil(size[1] * pixels_per_unit / 8)) * 8
+        size = np.array((crop_width, crop_height)) / pixels_per_unit
+    rect_width, rect_height = size * pixels_per_unit
+    if rect_width * rect_height >= full_width * full_height:
+        return None
+    return {
+        "center": (float(center[0]), float(center[1])),
+        "ortho_scale": float(size.max()),
+        "size": (int(crop_width), int(crop_height)),
+        "full": (int(full_width), int(full_height)),
+        "rect": (float((center[0] - size[0] / 2) * pixels_per_unit + full_width / 2),
+                 float(full_height / 2 - (center[1] + size[1] / 2) * pixels_per_unit),
+                 float(rect_width), float(rect_height)),
+    }
+
+def _resize(image, width, height):
+    # bilinear resample of an (h, w, c) array
+    src_height, src_width = image.shape[:2]
+    if (src_width, src_height) == (width, height):
+        return image
+    ys = np.clip((np.arange(height) + 0.5) * src_height / height - 0.5, 0, src_height - 1)
+    xs = np.clip((np.arange(width) + 0.5) * src_width / width - 0.5, 0, src_width - 1)
+    y0 = np.floor(ys).astype(np.int64)
+    x0 = np.floor(xs).astype(np.int64)
+    y1 = np.minimum(y0 + 1, src_height - 1)
+    x1 = np.minimum(x0 + 1, src_width - 1)
+    wy = (ys - y0)[:, None, None]
+    wx = (xs - x0)[None, :, None]
+    top = image[y0][:, x0] * (1 - wx) + image[y0][:, x1] * wx
+    bottom = image[y1][:, x0] * (1 - wx) + image[y1][:, x1] * wx
+    return (top * (1 - wy) + bottom * wy).astype(np.float32)
+
+def paste_crop(frame, roi, background=(1.0, 1.0, 1.0)):
+    # place a cropped result back where its region sits in the full frame
+    full_width, full_height = roi["full"]
+    x, y, width, height = roi["rect"]
+    left, top = int(round(x)), int(round(y))
+    patch = _resize(np.asarray(frame, dtype=np.float32)[..., :3], max(int(round(width)), 1), max(int(round(height)), 1))
+    canvas = np.empty((full_height, full_width, 3), dtype=np.float32)
+    canvas[:] = background
+    src_left, src_top = max(-left, 0), max(-top, 0)
+    dst_left, dst_top = max(left, 0), max(top, 0)
+    cols = min(patch.shape[1] - src_left, full_width - dst_left)
+    rows = min(patch.shape[0] - src_top, full_height - dst_top)
+    if cols > 0 and rows > 0:
+        canvas[dst_top:dst_top + rows, dst_left:dst_left + cols] = patch[src_top:src_top + rows, src_left:src_left + cols]
+    return canvas
+
+def _blend(window, mask, color):
+    alpha = color[3]
+    if alpha >= 1.0:
+        window[mask] = color
+    else:
+        window[mask] = window[mask] * (1.0 - alpha) + color * alpha
+
+def _fill_polygon(image, xy, color):
+    # even-odd scanline fill, toggles accumulated per row inside the polygon bounds
+    height, width = image.shape[:2]
+    left = max(int(np.floor(xy[:, 0].min())), 0)
+    right = min(int(np.ceil(xy[:, 0].max())) + 1, width)
+    top = max(int(np.floor(xy[:, 1].min())), 0)
+    bottom = min(int(np.ceil(xy[:, 1].max())) + 1, height)
+    if left >= right or top >= bottom:
+        return
+    x0, y0 = xy[:, 0], xy[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    row_start = np.ceil(np.minimum(y0, y1) - 0.5).astype(np.int64)
+    row_end = np.ceil(np.maximum(y0, y1) - 0.5).astype(np.int64)
+    row_count = np.maximum(row_end - row_start, 0)
+    edge = np.repeat(np.arange(len(xy)), row_count)
+    rows = np.repeat(row_start, row_count) + _ragged_arange(row_count)
+    keep = (rows >= top) & (rows < bottom)
+    edge = edge[keep]
+    rows = rows[keep]
+    centre = rows + 0.5
+    cross = x0[edge] + (centre - y0[edge]) * (x1[edge] - x0[edge]) / (y1[edge] - y0[edge])
+    cols = np.clip(np.ceil(cross - 0.5).astype(np.int64), left, right) - left
+    toggle = np.zeros((bottom - top, right - left + 1), dtype=np.int32)
+    np.add.at(toggle, (rows - top, cols), 1)
+    inside = (np.cumsum(toggle, axis=1)[:, :-1] & 1).astype(bool)
+    _blend(image[top:bottom, left:right], inside, color)
+
+def _draw_polyline(image, xy, radius, color):
+    # stamp discs along the stroke at half-pixel spacing
+    height, width = image.shape[:2]
+    if len(xy) > 1:
+        segment = np.diff(xy, axis=0)
+        samples = np.maximum(np.ceil(np.linalg.norm(segment, axis=1) / 0.5).astype(np.int64), 1)
+        seg_id = np.repeat(np.arange(len(segment)), samples)
+        t = (_ragged_arange(samples) / np.repeat(samples, samples))[:, None]
+        xy = np.concatenate((xy[:-1][seg_id] + segment[seg_id] * t, xy[-1:]))
+        radius = np.concatenate((radius[:-1][seg_id] + np.diff(radius)[seg_id] * t[:, 0], radius[-1:]))
+    reach = int(np.ceil(radius.max()))
+    dy, dx = np.mgrid[-reach:reach + 1, -reach:reach + 1]
+    dx = dx.ravel()
+    dy = dy.ravel()
+    centre = np.floor(xy).astype(np.int64)
+    inside = dx[None, :] ** 2 + dy[None, :] ** 2 <= np.maximum(radius, 0.5)[:, None] ** 2
+    cols = (centre[:, 0:1] + dx[None, :])[inside]
+    rows = (centre[:, 1:2] + dy[None, :])[inside]
+    keep = (cols >= 0) & (cols < width) & (rows >= 0) & (rows < height)
+    cols = cols[keep]
+    rows = rows[keep]
+    if not len(cols):
+        return
+    left, top = cols.min(), rows.min()
+    mask = np.zeros((rows.max() - top + 1, cols.max() - left + 1), dtype=bool)
+    mask[rows - top, cols - left] = True
+    _blend(image[top:top + mask.shape[0], left:left + mask.shape[1]], mask, color)
+
+# Rendered keyframes for this session, least recently used first
+KEYFRAME_CACHE_BYTES = 256 * 1024 * 1024
+_keyframe_images = collections.OrderedDict()
+
+def rasterize_gp_object(obj, frame_number, width, height, center=(0.0, 0.0), ortho_scale=10.0,
+                        background=(1.0, 1.0, 1.0, 1.0)):
+    # Draw the strokes shown at frame_number as seen by a top-down orthographic camera.
+    # Returns a read-only (height, width, 4) float32 RGBA image, first row at the top.
+    # Keyframes whose strokes, materials and framing are unchanged come from the cache.
+    pixels_per_unit = max(width, height) / ortho_scale
+    pixel_factor = getattr(obj.data, "pixel_factor", 1.0)
+
+    # (show_stroke, stroke_color, show_fill, fill_color) per material slot
+    default_style = (True, np.array((0.0, 0.0, 0.0, 1.0), dtype=np.float32), False, None)
+    styles = []
+    for slot in obj.material_slots:
+        mat = slot.material
+        if mat and mat.grease_pencil:
+            style = mat.grease_pencil
+            styles.append((style.show_stroke, np.array(style.color, dtype=np.float32),
+                           style.show_fill, np.array(style.fill_color, dtype=np.float32)))
+        else:
+            styles.append(default_style)
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((width, height, tuple(center), ortho_scale, tuple(background), pixel_factor)).encode())
+    for show_stroke, stroke_color, show_fill, fill_color in styles:
+        digest.update(repr((show_stroke, show_fill)).encode())
+        digest.update(stroke_color.tobytes())
+        digest.update(b"" if fill_color is None else fill_color.tobytes())
+    layers = []
+    for layer in obj.data.layers:
+        if layer.hide:
+            continue
+        frame = layer_frame_at(layer, frame_number)
+        if frame is None or not len(frame.strokes):
+            continue
+        arrays = read_frame_arrays(frame)
+        matrix = np.array(obj.matrix_world @ layer.matrix_layer, dtype=np.float32)
+        layers.append((arrays, matrix, layer.opacity))
+        digest.update(arrays.fingerprint().encode())
+        digest.update(matrix.tobytes())
+        digest.update(repr(layer.opacity).encode())
+    key = digest.hexdigest()
+
+    image = _keyframe_images.get(key)
+    if image is not None:
+        _keyframe_images.move_to_end(key)
+        return image
+
+    image = np.empty((height, width, 4), dtype=np.float32)
+    image[:] = background
+    for arrays, matrix, opacity in layers:
+        world = arrays.co @ matrix[:3, :3].T + matrix[:3, 3]
+        xy = np.empty((len(world), 2), dtype=np.float64)
+        xy[:, 0] = (world[:, 0] - center[0]) * pixels_per_unit + width / 2
+        xy[:, 1] = height / 2 - (world[:, 1] - center[1]) * pixels_per_unit
+        radius = arrays.pressure * pixel_factor * pixels_per_unit / 2000.0
+        for i, (start, count) in enumerate(zip(arrays.offsets, arrays.counts)):
+            if not count:
+                continue
+            points = slice(start, start + count)
+            index = int(arrays.material_index[i])
+            show_stroke, stroke_color, show_fill, fill_color = styles[index] if index < len(styles) else default_style
+            if show_fill and count > 2:
+                _fill_polygon(image, xy[points], fill_color * (1.0, 1.0, 1.0, opacity))
+            if show_stroke:
+                _draw_polyline(image, xy[points], radius[points] * arrays.line_width[i],
+                               stroke_color * (1.0, 1.0, 1.0, opacity))
+
+    image.flags.writeable = False
+    _keyframe_images[key] = image
+    total = sum(cached.nbytes for cached in _keyframe_images.values())
+    while total > KEYFRAME_CACHE_BYTES and len(_keyframe_images) > 1:
+        total -= _keyframe_images.popitem(last=False)[1].nbytes
+    return image
+
+def write_frame_sequence(frames, directory):
+    # lossless frame001.png, frame002.png, ... from float RGB(A) arrays
+    os.makedirs(directory, exist_ok=True)
+    for index, frame in enumerate(frames, 1):
+        frame = np.asarray(frame, dtype=np.float32)
+        if frame.shape[2] == 3:
+            frame = np.concatenate((frame, np.ones(frame.shape[:2] + (1,), dtype=np.float32)), axis=2)
+        save_png(frame, os.path.join(directory, f"frame{index:03d}.png"))
+
+def save_png(image, path):
+    # write a top-down RGBA array through a temporary image datablock
+    height, width = image.shape[:2]
+    img = bpy.data.images.new("SB_Raster", width, height, alpha=True)
+    try:
+        img.pixels.foreach_set(np.ascontiguousarray(image[::-1]).ravel())
+        img.filepath_raw = path
+        img.file_format = 'PNG'
+        img.save()
+    finally:
+        bpy.data.images.remove(img)
+
+#---------------------------------------------------------------------
+#    Result Cache
+#---------------------------------------------------------------------
+
+def ai_cache_key(images, settings):
+    digest = hashlib.blake2b(digest_size=20)
+    for image in images:
+        digest.update(str(image.shape).encode())
+        digest.update(np.ascontiguousarray(image).tobytes())
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    return digest.hexdigest()
+
+def _dir_size(path):
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+class ResultCache:
+    """Content-addressed store of AI tween frame directories, evicted least recently used first"""
+
+    def __init__(self):
+        self.root = None
+        self.budget = 0
+        self.entries = collections.OrderedDict()    # key -> size in bytes, oldest first
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, root, budget):
+        self.budget = budget
+        if root == self.root:
+            return
+        self.root = root
+        self.entries.clear()
+        os.makedirs(root, exist_ok=True)
+        # rebuild LRU order from directory mtimes, which lookups refresh
+        found = []
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            if os.path.isdir(path):
+                found.append((os.path.getmtime(path), name, _dir_size(path)))
+        for mtime, name, size in sorted(found):
+            self.entries[name] = size
+
+    @property
+    def size(self):
+        return sum(self.entries.values())
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def path(self, key):
+        return os.path.normpath(os.path.join(self.root, key))
+
+    def lookup(self, key):
+        if key in self.entries and os.path.isdir(self.path(key)):
+            self.entries.move_to_end(key)
+            os.utime(self.path(key))
+            self.hits += 1
+            return self.path(key)
+        self.entries.pop(key, None)
+        self.misses += 1
+        return None
+
+    def store(self, key, source_dir, pinned=()):
+        # move a finished result into the cache and return its new location
+        target = self.path(key)
+        if os.path.isdir(target):
+            shutil.rmtree(source_dir, ignore_errors=True)
+        else:
+            shutil.move(source_dir, target)
+        self.entries[key] = _dir_size(target)
+        self.entries.move_to_end(key)
+        self.evict(set(pinned) | {target})
+        return target
+
+    def evict(self, pinned=()):
+        # pinned directories are still shown in the scene and are never removed
+        for key in list(self.entries):
+            if self.size <= self.budget:
+                break
+            if self.path(key) in pinned:
+                continue
+            shutil.rmtree(self.path(key), ignore_errors=True)
+            del self.entries[key]
+
+    def prune(self):
+        # forget entries whose directories the workspace quota removed
+        for key in [key for key in self.entries if not os.path.isdir(self.path(key))]:
+            del self.entries[key]
+
+    def clear(self, pinned=()):
+        budget = self.budget
+        self.budget = 0
+        self.evict(pinned)
+        self.budget = budget
+
+result_cache = ResultCache()
+
+def ai_cache_root(tool):
+    if tool.ai_cache_dir:
+        return bpy.path.abspath(tool.ai_cache_dir)
+    return os.path.join(workspace_root(tool), "cache")
+
+def referenced_sequence_dirs():
+    dirs = {os.path.normpath(os.path.dirname(bpy.path.abspath(img.filepath)))
+            for img in bpy.data.images if img.source == 'SEQUENCE' and img.filepath}
+    # memory playback shows a generated image but still reads misses from disk
+    dirs.update(os.path.normpath(obj["sb_sequence_dir"]) for obj in bpy.data.objects if "sb_sequence_dir" in obj)
+    return dirs
+
+def protected_sequence_dirs():
+    # shown in this file, or recorded as shown by another saved file
+    return referenced_sequence_dirs() | workspace.foreign_references(bpy.data.filepath)
+
+def record_references():
+    # after a save: remember what the saved file shows so other sessions never evict it
+    if bpy.data.filepath:
+        configure_workspace(bpy.context.scene.smart_bone_tool)
+        workspace.record_references(bpy.data.filepath, referenced_sequence_dirs())
+
+#---------------------------------------------------------------------
+#    Workspace
+#---------------------------------------------------------------------
+
+class Workspace:
+    """Scratch space for AI tween jobs and the results they leave in the scene"""
+
+    def __init__(self):
+        self.root = None
+        self.quota = 0
+        self.max_age = 0
+
+    def configure(self, root, quota, max_age):
+        self.root = os.path.normpath(root)
+        self.quota = quota
+        self.max_age = max_age
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        os.makedirs(self.results_dir, exist_ok=True)
+
+    @property
+    def jobs_dir(self):
+        return os.path.join(self.root, "jobs")
+
+    @property
+    def results_dir(self):
+        return os.path.join(self.root, "results")
+
+    @property
+    def cache_dir(self):
+        return os.path.join(self.root, "cache")
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.root, "references.json")
+
+    def references(self):
+        # saved .blend file -> sequence directories it showed when last saved
+        if self.root is None:
+            return {}
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def record_references(self, blend_path, dirs):
+        references = {path: used for path, used in self.references().items() if os.path.isfile(path)}
+        references[os.path.normpath(blend_path)] = sorted(dirs)
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(references, f, indent=1)
+        os.replace(temp_path, self.manifest_path)
+
+    def foreign_references(self, current):
+        current = os.path.normpath(current) if current else ""
+        return {os.path.normpath(directory) for path, used in self.references().items()
+                if path != current and os.path.isfile(path) for directory in used}
+
+    def job_dir(self):
+        return tempfile.mkdtemp(prefix="job_", dir=self.jobs_dir)
+
+    def keep(self, directory, name):
+        # move a finished result out of its job directory so the job can be discarded
+        target = os.path.join(self.results_dir, name)
+        shutil.move(directory, target)
+        return target
+
+    def discard(self, directory):
+        if directory and self.root and os.path.normpath(directory).startswith(self.root + os.sep):
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def _entries(self):
+        # the default cache lives in the workspace and counts towards its quota
+        entries = []
+        for parent in (self.jobs_dir, self.results_dir, self.cache_dir):
+            if not os.path.isdir(parent):
+                continue
+            for name in os.listdir(parent):
+                path = os.path.join(parent, name)
+                if os.path.isdir(path):
+                    entries.append((os.path.getmtime(path), path, _dir_size(path)))
+        return sorted(entries)
+
+    def usage(self):
+        return sum(size for mtime, path, size in self._entries())
+
+    def enforce(self, pinned=(), active=()):
+        # drop expired entries, then the oldest ones until under quota; results
+        # shown in this or another saved file and running jobs are never touched
+        now = time.time()
+        entries = self._entries()
+        total = sum(size for mtime, path, size in entries)
+        for mtime, path, size in entries:
+            if path in pinned or path in active:
+                continue
+            if now - mtime > self.max_age or total > self.quota:
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+
+workspace = Workspace()
+
+def workspace_root(tool):
+    if tool.ai_workspace_dir:
+        return bpy.path.abspath(tool.ai_workspace_dir)
+    base = tempfile.gettempdir()
+    if tool.ai_workspace_ram and os.path.isdir("/dev/shm"):
+        base = "/dev/shm"
+    return os.path.join(base, "smart2d_workspace")
+
+def configure_workspace(tool):
+    workspace.configure(workspace_root(tool), tool.ai_workspace_quota * 1024 * 1024,
+                        tool.ai_workspace_max_age * 3600)
+
+#---------------------------------------------------------------------
+#    AI Playback
+#---------------------------------------------------------------------
+
+# Decoded AI tween frames as flat RGBA in Blender pixel order, least recently shown first
+_playback_frames = collections.OrderedDict()
+_playback_files = {}            # sequence directory -> sorted frame file names
+_playback_shown = {}            # empty name -> frame index currently displayed
+
+def to_blender_pixels(frame):
+    # top-down RGB(A) float array -> read-only flat bottom-up RGBA
+    frame = np.asarray(frame, dtype=np.float32)
+    if frame.shape[2] == 3:
+        frame = np.concatenate((frame, np.ones(frame.shape[:2] + (1,), dtype=np.float32)), axis=2)
+    pixels = np.ascontiguousarray(frame[::-1]).ravel()
+    pixels.flags.writeable = False
+    return pixels
+
+def load_png_pixels(path):
+    img = bpy.data.images.load(path, check_existing=False)
+    try:
+        pixels = np.empty(len(img.pixels), dtype=np.float32)
+        img.pixels.foreach_get(pixels)
+    finally:
+        bpy.data.images.remove(img)
+    pixels.flags.writeable = False
+    return pixels
+
+def available_memory():
+    # bytes the system can still hand out, None where the platform doesn't say
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def sequence_files(directory):
+    files = _playback_files.get(directory)
+    if files is None:
+        files = sorted(name for name in os.listdir(directory) if name.endswith(".png")) if os.path.isdir(directory) else []
+        _playback_files[directory] = files
+    return files
+
+def cache_playback_frame(key, pixels, budget):
+    _playback_frames[key] = pixels
+    _playback_frames.move_to_end(key)
+    total = sum(cached.nbytes for cached in _playback_frames.values())
+    while total > budget and len(_playback_frames) > 1:
+        total -= _playback_frames.popitem(last=False)[1].nbytes
+
+def playback_frame(directory, name, budget):
+    # budget 0 streams from disk without caching
+    key = (directory, name)
+    pixels = _playback_frames.get(key)
+    if pixels is not None:
+        _playback_frames.move_to_end(key)
+        return pixels
+    pixels = load_png_pixels(os.path.join(directory, name))
+    if budget:
+        cache_playback_frame(key, pixels, budget)
+    return pixels
+
+def free_playback_cache():
+    _playback_frames.clear()
+    _playback_files.clear()
+    _playback_shown.clear()
+
+@bpy.app.handlers.persistent
+def update_ai_playback(scene, depsgraph=None):
+    # show the current frame of every memory or packed AI tween empty
+    tool = scene.smart_bone_tool
+    budget = tool.ai_playback_budget * 1024 * 1024
+    if tool.ai_playback_low_memory:
+        free = available_memory()
+        if free is not None and free < tool.ai_playback_min_free * 1024 * 1024:
+            _playback_frames.clear()
+            budget = 0
+    for obj in scene.objects:
+        mode = obj.get("sb_playback")
+        if mode is None or obj.type != 'EMPTY':
+            continue
+        index = min(max(scene.frame_current - obj["sb_frame_start"], 0), obj["sb_frame_count"] - 1)
+        if _playback_shown.get(obj.name) == index:
+            continue
+        if mode == 'PACKED':
+            img = bpy.data.images.get(f"{obj['sb_frame_prefix']}{index + 1:03d}")
+            if img is not None:
+                obj.data = img
+        elif obj.data is not None:
+            files = sequence_files(obj["sb_sequence_dir"])
+            if index >= len(files):
+                continue
+            pixels = playback_frame(obj["sb_sequence_dir"], files[index], budget)
+            if len(obj.data.pixels) == len(pixels):
+                obj.data.pixels.foreach_set(pixels)
+                obj.data.update()
+        _playback_shown[obj.name] = index
+
+def enable_playback():
+    # only files with memory or packed AI tweens pay for the frame handler
+    if update_ai_playback not in bpy.app.handlers.frame_change_post:
+        bpy.app.handlers.frame_change_post.append(update_ai_playback)
+
+def disable_playback():
+    free_playback_cache()
+    if update_ai_playback in bpy.app.handlers.frame_change_post:
+        bpy.app.handlers.frame_change_post.remove(update_ai_playback)
+
+#---------------------------------------------------------------------
+#    Interpolation Worker
+#---------------------------------------------------------------------
+
+# The model process itself lives in ai_worker.py
+AI_WORKER_PATH = os.path.join(os.path.dirname(__file__), "ai_worker.py")
+
+class InterpolationWorker:
+    """Long-lived backend process that keeps one interpolation model loaded"""
+
+    def __init__(self):
+        self.key = None
+        self.process = None
+        self.conn = None
+        self.lock = threading.Lock()
+        self.load_seconds = 0.0
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self, key, backend, cwd, model_path, idle_timeout, options):
+        self.stop()
+        authkey = os.urandom(16)
+        env = dict(os.environ, SB_WORKER_AUTHKEY=authkey.hex(), SB_WORKER_IDLE=str(idle_timeout))
+        if options.get("device") == "cpu":
+            # hide the GPU so neither backend initialises CUDA
+            env["CUDA_VISIBLE_DEVICES"] = ""
+        if options.get("threads"):
+            env["OMP_NUM_THREADS"] = str(options["threads"])
+        if options.get("cores"):
+            env["SB_WORKER_CORES"] = ",".join(map(str, options["cores"]))
+        self.process = subprocess.Popen([sys.executable, AI_WORKER_PATH],
+                                        cwd=cwd, env=env, stdout=subprocess.PIPE, text=True)
+        port = self.process.stdout.readline().strip()
+        self.process.stdout.close()
+        if not port:
+            self.stop()
+            raise RuntimeError("interpolation worker did not start")
+        self.conn = Client(("127.0.0.1", int(port)), authkey=authkey)
+        load = {"op": "load", "backend": backend, "model_path": model_path, "options": options}
+        try:
+            self.load_seconds = self._call(load, None)["seconds"]
+        except BaseException:
+            # a worker without a model must not be reused for these settings
+            self.stop()
+            raise
+        self.key = key
+
+    def stop(self):
+        if self.conn is not None:
+            try:
+                self.conn.send({"op": "quit"})
+            except OSError:
+                pass
+            self.conn.close()
+            self.conn = None
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+        self.key = None
+
+    def _call(self, message, cancel_event):
+        self.conn.send(message)
+        while not self.conn.poll(0.1):
+            if cancel_event is not None and cancel_event.is_set():
+                # the model can't be interrupted mid-inference, so drop the process
+                self.process.kill()
+                self.stop()
+                return None
+            if not self.alive:
+                raise EOFError("interpolation worker exited")
+        reply = self.conn.recv()
+        if not reply["ok"]:
+            raise RuntimeError(reply["error"])
+        return reply
+
+    def request(self, job, backend, cwd, model_path, idle_timeout, message, options=None):
+        # restart on settings change, idle exit or crash, retrying once after a crash;
+        # load options such as thread counts only take effect in a fresh process
+        options = options or {}
+        key = (backend, cwd, model_path, tuple(sorted(options.items())))
+        with self.lock:
+            for attempt in range(2):
+                if not self.alive or self.key != key:
+                    self.start(key, backend, cwd, model_path, idle_timeout, options)
+                try:
+                    return self._call(message, job.cancel_event)
+                except (EOFError, OSError):
+                    self.stop()
+                    if attempt:
+                        raise
+
+interpolation_worker = InterpolationWorker()
+
+def composite_roi(job, roi):
+    if job.data.get("frames") is not None:
+        job.data["frames"] = [paste_crop(frame, roi) for frame in job.data["frames"]]
+
+def share_frames(frames):
+    # one shared block holding every frame, plus the descriptor the worker needs
+    stack = np.ascontiguousarray(np.stack(frames), dtype=np.float32)
+    block = shared_memory.SharedMemory(create=True, size=max(stack.nbytes, 1))
+    np.ndarray(stack.shape, dtype=np.float32, buffer=block.buf)[:] = stack
+    return block, {"name": block.name, "shape": stack.shape, "dtype": "float32"}
+
+def receive_frames(descriptor):
+    # copy the worker's output block and free it
+    block = shared_memory.SharedMemory(name=descriptor["name"])
+    try:
+        return list(np.array(np.ndarray(descriptor["shape"], dtype=descriptor["dtype"], buffer=block.buf)))
+    finally:
+        block.close()
+        block.unlink()
+
+def parse_core_list(text):
+    # "0-3,6" -> (0, 1, 2, 3, 6)
+    cores = set()
+    for part in text.replace(" ", "").split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cores.update(range(int(first), int(last or first) + 1))
+    return tuple(sorted(cores))
+
+def ai_worker_options(tool):
+    # load options for the model process; they key the warm worker, so
+    # changing any of them restarts it
+    options = {"threads": preset_threads(tool.ai_preset)}
+    if tool.ai_cpu_mode:
+        cores = parse_core_list(tool.ai_cpu_cores)
+        options.update(
+            device="cpu",
+            threads=tool.ai_cpu_threads or preset_threads(tool.ai_preset, len(cores)),
+            interop_threads=tool.ai_cpu_interop_threads,
+            cores=cores,
+            quantize=tool.ai_cpu_quantize and tool.interpolator_type == 'TOONCRAFTER',
+        )
+    return options
+
+def ai_worker_request(tool, paths, width, height, steps, seed, precision):
+    if tool.interpolator_type == 'FILM':
+        return {
+            "op": "interpolate",
+            "frames": paths,
+            "times": tool.ai_times_to_interpolate,
+        }
+    return {
+        "op": "interpolate",
+        "frames": paths,
+        "batch_size": tool.ai_batch_size,
+        "prompt": tool.ai_prompt,
+        "video_length": tool.ai_times_to_interpolate + 2,
+        "width": width,
+        "height": height,
+        "steps": steps,
+        "seed": seed,
+        "precision": precision,
+    }
+
+def run_worker_inference(job, **kwargs):
+    reply = interpolation_worker.request(job, **kwargs)
+    if reply is not None:
+        job.data["frames"] = receive_frames(reply["shared"]) if "shared" in reply else reply["frames"]
+        job.data["counts"] = reply.get("counts")
+
+#---------------------------------------------------------------------
+#    AI Jobs
+#---------------------------------------------------------------------
+
+class AITweenJob:
+    """One AI tween: inputs prepared on the main thread, slow stages run in the background"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, label, stages):
+        self.id = next(self._ids)
+        self.label = label
+        self.stages = stages            # [(stage name, callable(job)), ...]
+        self.stage = "Queued"
+        self.stage_index = 0
+        self.state = 'PENDING'          # PENDING, RUNNING, DONE, FAILED, CANCELLED
+        self.error = ""
+        self.started = None
+        self.elapsed = None
+        self.cancel_event = threading.Event()
+        self.data = {}                  # whatever the operator needs to finish the job
+
+    @property
+    def finished(self):
+        return self.state in {'DONE', 'FAILED', 'CANCELLED'}
+
+    @property
+    def progress(self):
+        return self.stage_index / max(len(self.stages), 1)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def release(self):
+        # free the shared input block once the worker no longer needs it
+        block = self.data.pop("shared_input", None)
+        if block is not None:
+            block.close()
+            block.unlink()
+
+_ai_jobs = []
+_ai_job_queue = queue.Queue()
+_ai_job_thread = None
+
+def run_subprocess(job, cmd, cwd=None):
+    # external command that is terminated as soon as the job is cancelled
+    process = subprocess.Popen(cmd, cwd=cwd)
+    while process.poll() is None:
+        if job.cancel_event.wait(0.1):
+            process.terminate()
+            process.wait()
+            return
+    if process.returncode != 0:
+        raise RuntimeError(f"exited with code {process.returncode}")
+
+def run_ai_job(job):
+    # run every stage of a job in order, stopping early on failure or cancel
+    job.state = 'RUNNING'
+    job.started = time.perf_counter()
+    for index, (stage, run) in enumerate(job.stages):
+        if job.cancel_event.is_set():
+            break
+        job.stage = stage
+        job.stage_index = index
+        try:
+            run(job)
+        except Exception as e:
+            # any stage error fails this job only; the queue carries on
+            job.error = f"{stage} failed: {e}"
+            job.state = 'FAILED'
+            return
+    if job.cancel_event.is_set():
+        job.state = 'CANCELLED'
+    else:
+        job.stage_index = len(job.stages)
+        job.stage = "Done"
+        job.state = 'DONE'
+        job.elapsed = time.perf_counter() - job.started
+
+def _ai_job_loop():
+    # one job at a time: inference already saturates the CPU
+    while True:
+        job = _ai_job_queue.get()
+        if job is None:
+            break
+        if job.cancel_event.is_set():
+            job.state = 'CANCELLED'
+            continue
+        try:
+            run_ai_job(job)
+        except Exception as e:
+            # never leave a job RUNNING for a modal to poll forever
+            job.error = f"{job.stage} failed: {e}"
+            job.state = 'FAILED'
+
+def submit_ai_job(job):
+    global _ai_job_thread
+    _ai_jobs.append(job)
+    if _ai_job_thread is None or not _ai_job_thread.is_alive():
+        _ai_job_thread = threading.Thread(target=_ai_job_loop, name="SB_AIJobs", daemon=True)
+        _ai_job_thread.start()
+    _ai_job_queue.put(job)
+
+# mean wall time of finished tweens per (interpolator, preset): [total seconds, runs]
+preset_timings = {}
+
+def record_preset_time(model_type, preset, seconds):
+    total = preset_timings.setdefault((model_type, preset), [0.0, 0])
+    total[0] += seconds
+    total[1] += 1
+
+# last CPU benchmark per interpolator: [(run name, seconds, speedup), ...], the
+# speedup over the run differing only in that setting, None for the default run
+cpu_benchmarks = {}
+
+def shot_keyframes(obj, exclude_breakdowns=False):
+    # drawn keyframe numbers across the visible layers of a GP object
+    return sorted({f.frame_number for layer in obj.data.layers if not layer.hide
+                   for f in layer.frames if is_extreme(f, exclude_breakdowns)})
+
+def retime_clips(frames, counts, keys):
+    # one frame per timeline frame from the first key to the last, each gap sampled from its clip
+    timeline = []
+    start = 0
+    for k0, k1, count in zip(keys, keys[1:], counts):
+        clip = frames[start:start + count]
+        start += count
+        for frame_number in range(k0, k1):
+            timeline.append(clip[int((frame_number - k0) / (k1 - k0) * (count - 1) + 0.5)])
+    timeline.append(clip[-1])
+    return timeline
+
+def find_ai_job(job_id):
+    for job in _ai_jobs:
+        if job.id == job_id:
+            return job
+    return None
+
+def start_job_modal(op, context, job, interval=0.25):
+    # queue the job and let the operator's modal() poll it from a window timer
+    submit_ai_job(job)
+    op._job = job
+    op._timer = context.window_manager.event_timer_add(interval, window=context.window)
+    context.window_manager.modal_handler_add(op)
+    return {'RUNNING_MODAL'}
+
+def poll_job_modal(op, context, event, finish):
+    if event.type != 'TIMER':
+        return {'PASS_THROUGH'}
+    for area in context.screen.areas:
+        if area.type == 'DOPESHEET_EDITOR':
+            area.tag_redraw()
+    if not op._job.finished:
+        return {'PASS_THROUGH'}
+    context.window_manager.event_timer_remove(op._timer)
+    return finish(op, context, op._job)
+
+def shutdown_ai_jobs():
+    global _ai_job_thread
+    for job in _ai_jobs:
+        job.cancel()
+        job.release()
+        workspace.discard(job.data.get("temp_dir"))
+    if _ai_job_thread is not None:
+        _ai_job_queue.put(None)
+        _ai_job_thread = None
+    interpolation_worker.stop()
+
+#---------------------------------------------------------------------
+#    Operators
+#---------------------------------------------------------------------
+
+def tween_execute(op, context):
+    # blocking path for scripts and background mode
+    job = prepare_tween(op, context)
+    if job is None:
+        return {'CANCELLED'}
+    run_ai_job(job)
+    return finish_tween(op, context, job)
+
+def tween_invoke(op, context, event):
+    job = prepare_tween(op, context)
+    if job is None:
+        return {'CANCELLED'}
+    if not job.stages:
+        # cache hit, nothing to wait for
+        run_ai_job(job)
+        return finish_tween(op, context, job)
+    op.report({'INFO'}, f"Queued {job.label}")
+    return start_job_modal(op, context, job)
+
+def tween_modal(op, context, event):
+    return poll_job_modal(op, context, event, finish_tween)
+
+def prepare_tween(op, context):
+    tool = context.scene.smart_bone_tool
+    model_type = tool.interpolator_type
+
+    if model_type == 'FILM':
+        if not tool.film_path or not tool.model_path:
+            op.report({'ERROR'}, "Set FILM and model paths")
+            return None
+    elif model_type == 'TOONCRAFTER':
+        if not tool.tooncrafter_path or not tool.model_path:
+            op.report({'ERROR'}, "Set ToonCrafter and model paths")
+            return None
+
+    obj = context.object
+    if not obj or obj.type != 'GPENCIL':
+        op.report({'ERROR'}, "Select Grease Pencil")
+        return None
+
+    try:
+        options = ai_worker_options(tool)
+    except ValueError:
+        op.report({'ERROR'}, f"Invalid core list '{tool.ai_cpu_cores}'")
+        return None
+
+    if op.shot:
+        keys = shot_keyframes(obj, op.exclude_breakdowns)
+        if len(keys) < 2:
+            op.report({'ERROR'}, "Whole shot needs at least two keyframes")
+            return None
+        if not tool.use_ai_worker:
+            op.report({'ERROR'}, "Whole shot tweening needs Keep Model Loaded")
+            return None
+        label = f"{obj.name} shot {keys[0]}-{keys[-1]}"
+    else:
+        keys = [context.scene.frame_current, context.scene.frame_current + 1]
+        label = f"{obj.name} {keys[0]}-{keys[1]}"
+
+    # Rasterize the keyframes directly, framed like a top-down ortho camera,
+    # or only the region they cover when cropping
+    width, height = model_resolution(tool, context.scene)
+    roi = None
+    if tool.ai_crop_to_bounds and tool.use_ai_worker:
+        bounds = gp_world_bounds(obj, keys)
+        if bounds is not None:
+            model_size = (width, height) if model_type == 'TOONCRAFTER' else None
+            roi = crop_view(bounds, (width, height), model_size, tool.ai_crop_margin)
+    if roi:
+        width, height = roi["size"]
+        images = [rasterize_gp_object(obj, frame_number, width, height, roi["center"], roi["ortho_scale"])
+                  for frame_number in keys]
+    else:
+        images = [rasterize_gp_object(obj, frame_number, width, height) for frame_number in keys]
+
+    preset = AI_PRESETS[tool.ai_preset]
+    frames_out = tool.ai_times_to_interpolate + 2
+    steps = preset["steps"]
+    seed = 42
+    frame_start = keys[0] if op.shot else 1
+
+    cache_key = None
+    if tool.use_ai_cache:
+        result_cache.configure(ai_cache_root(tool), tool.ai_cache_budget * 1024 * 1024)
+        cache_key = ai_cache_key(images, {
+            "interpolator_type": model_type,
+            "model_path": tool.model_path,
+            "ai_prompt": tool.ai_prompt,
+            "ai_times_to_interpolate": tool.ai_times_to_interpolate,
+            "steps": steps,
+            "seed": seed,
+            "precision": preset["precision"],
+            "quantize": options.get("quantize", False),
+            "keys": keys if op.shot else None,
+            "roi": roi,
+        })
+        cached = result_cache.lookup(cache_key)
+        if cached:
+            job = AITweenJob(label, [])
+            job.data = {"temp_dir": None, "sequence_dir": cached, "frame_start": frame_start}
+            return job
+
+    # The warm worker reads frames from shared memory; PNGs are only for the
+    # one-shot scripts or when asked for while debugging
+    configure_workspace(tool)
+    temp_dir = workspace.job_dir()
+    paths = [os.path.join(temp_dir, f"frame{index}.png") for index in range(1, len(keys) + 1)]
+    path1, path2 = paths[0], paths[-1]
+    out_dir = os.path.join(temp_dir, "output")
+    sequence_dir = os.path.join(out_dir, "frames")
+    if tool.ai_debug_frames or not tool.use_ai_worker:
+        for path, image in zip(paths, images):
+            save_png(image, path)
+
+    stages = []
+    request = ai_worker_request(tool, paths, width, height, steps, seed, preset["precision"])
+    if model_type == 'FILM':
+        cwd = tool.film_path
+
+        # Call FILM interpolator_cli, which writes PNG frames next to its inputs
+        cmd = [
+            sys.executable, "-m", "frame_interpolation.interpolator_cli",
+            "--pattern", temp_dir + "/frame*.png",
+            "--model_path", tool.model_path,
+            "--times_to_interpolate", str(tool.ai_times_to_interpolate)
+        ]
+        if not tool.use_ai_worker:
+            sequence_dir = os.path.join(temp_dir, "interpolated_frames")
+
+    elif model_type == 'TOONCRAFTER':
+        cwd = tool.tooncrafter_path
+
+        # Create temp config yaml
+        config_path = os.path.join(temp_dir, "config.yaml")
+        with open(config_path, 'w') as f:
+            f.write(f"""
+prompts:
+  - "{tool.ai_prompt}"
+image_path_1: "{path1}"
+image_path_2: "{path2}"
+video_length: {frames_out}
+width: {width}
+height: {height}
+fps: 8
+use_ddpm: False
+steps: {steps}
+seed: {seed}
+""")
+
+        cmd = [
+            sys.executable, "inference.py",
+            "--config", config_path,
+            "--savedir", out_dir,
+            "--ckpt", tool.model_path,
+            "--bs", "1",
+            "--seed", str(seed)
+        ]
+        if not tool.use_ai_worker:
+            # the one-shot script only writes a GIF; split it without resampling
+            os.makedirs(sequence_dir, exist_ok=True)
+            gif_path = os.path.join(out_dir, "samples", "sample_0", "video.gif")
+            extract = ['ffmpeg', '-i', gif_path, '-vsync', '0', os.path.join(sequence_dir, 'frame%03d.png')]
+            stages.append(("Extract", functools.partial(run_subprocess, cmd=extract)))
+
+    shared_input = None
+    if tool.use_ai_worker:
+        shared_input, request["shared"] = share_frames([image[..., :3] for image in images])
+        request["shared_reply"] = True
+        inference = functools.partial(run_worker_inference, backend=model_type, cwd=cwd,
+                                      model_path=tool.model_path, idle_timeout=tool.ai_worker_idle_timeout,
+                                      message=request, options=options)
+    else:
+        inference = functools.partial(run_subprocess, cmd=cmd, cwd=cwd)
+    stages.insert(0, ("Inference", inference))
+    if roi:
+        stages.append(("Composite", functools.partial(composite_roi, roi=roi)))
+
+    job = AITweenJob(label, stages)
+    job.data = {
+        "temp_dir": temp_dir,
+        "sequence_dir": sequence_dir,
+        "cache_key": cache_key,
+        "frame_start": frame_start,
+        "keys": keys if op.shot else None,
+        "timing": (model_type, tool.ai_preset),
+    }
+    if shared_input is not None:
+        job.data["shared_input"] = shared_input
+    return job
+
+def finish_tween(op, context, job):
+    job.release()
+    if job in _ai_jobs:
+        _ai_jobs.remove(job)
+    temp_dir = job.data["temp_dir"]
+    if job.state in {'CANCELLED', 'FAILED'}:
+        workspace.discard(temp_dir)
+        if job.state == 'CANCELLED':
+            op.report({'WARNING'}, f"Cancelled {job.label}")
+        else:
+            op.report({'ERROR'}, job.error)
+        return {'CANCELLED'}
+
+    if job.elapsed is not None and job.data.get("timing"):
+        record_preset_time(*job.data["timing"], job.elapsed)
+
+    sequence_dir = job.data["sequence_dir"]
+    if temp_dir:
+        # keep the frames, via the cache when enabled, and drop the rest of the job
+        frames = job.data.pop("frames", None)
+        if frames is not None:
+            if job.data["keys"] and job.data.get("counts"):
+                frames = retime_clips(frames, job.data["counts"], job.data["keys"])
+            write_frame_sequence(frames, sequence_dir)
+            job.data["frames"] = frames
+        if os.path.isdir(sequence_dir):
+            if job.data.get("cache_key"):
+                sequence_dir = result_cache.store(job.data["cache_key"], sequence_dir, protected_sequence_dirs())
+            else:
+                sequence_dir = workspace.keep(sequence_dir, f"{int(time.time())}_{job.id}")
+        workspace.discard(temp_dir)
+        workspace.enforce(protected_sequence_dirs() | {sequence_dir},
+                          {other.data.get("temp_dir") for other in _ai_jobs})
+        result_cache.prune()
+    frame_files = []
+    if os.path.isdir(sequence_dir):
+        frame_files = sorted(name for name in os.listdir(sequence_dir) if name.endswith(".png"))
+    if not frame_files:
+        op.report({'ERROR'}, f"No interpolated frames in {sequence_dir}")
+        return {'CANCELLED'}
+
+    # Import to Blender as image sequence reference
+    tool = context.scene.smart_bone_tool
+    mode = tool.ai_playback_mode
+    bpy.ops.object.empty_add(type='IMAGE')
+    empty = context.object
+    empty.name = "AI_Interp_Seq"
+    empty.empty_display_size = 5  # Adjust
+    first = bpy.data.images.load(os.path.join(sequence_dir, frame_files[0]), check_existing=False)
+    if mode == 'DISK':
+        first.name = "AIInterpSeq"
+        first.source = 'SEQUENCE'
+        empty.data = first
+        empty.image_user.frame_duration = len(frame_files)
+        empty.image_user.frame_start = job.data["frame_start"]
+        empty.image_user.use_auto_refresh = True
+        op.report({'INFO'}, f"AI interpolated frames imported as image sequence empty from {sequence_dir}")
+        return {'FINISHED'}
+
+    empty["sb_playback"] = mode
+    empty["sb_frame_start"] = job.data["frame_start"]
+    empty["sb_frame_count"] = len(frame_files)
+    if mode == 'PACKED':
+        # the .blend carries the frames, the sequence on disk is no longer needed
+        prefix = f"AIInterp_{os.path.basename(sequence_dir)[:16]}_"
+        empty["sb_frame_prefix"] = prefix
+        for index, name in enumerate(frame_files, 1):
+            img = first if index == 1 else bpy.data.images.load(os.path.join(sequence_dir, name),
+                                                               check_existing=False)
+            img.name = f"{prefix}{index:03d}"
+            img.pack()
+        empty.data = first
+    else:
+        # decode up front, from the frames still in memory when there are any
+        budget = tool.ai_playback_budget * 1024 * 1024
+        width, height = first.size
+        bpy.data.images.remove(first)
+        frames = job.data.pop("frames", None)
+        _playback_files[sequence_dir] = frame_files
+        for index, name in enumerate(frame_files[:budget // (width * height * 16)]):
+            if frames is not None:
+                pixels = to_blender_pixels(frames[index])
+            else:
+                pixels = load_png_pixels(os.path.join(sequence_dir, name))
+            cache_playback_frame((sequence_dir, name), pixels, budget)
+        empty["sb_sequence_dir"] = sequence_dir
+        # byte buffer: the frames hold sRGB values, like the PNGs they came from
+        empty.data = bpy.data.images.new("AIInterpSeq", width, height, alpha=True)
+    _playback_shown.pop(empty.name, None)
+    enable_playback()
+    update_ai_playback(context.scene)
+
+    op.report({'INFO'}, f"AI interpolated frames imported for {mode.lower()} playback from {sequence_dir}")
+    return {'FINISHED'}
+
+def benchmark_execute(op, context):
+    # blocking path for scripts and background mode
+    job = prepare_benchmark(op, context)
+    if job is None:
+        return {'CANCELLED'}
+    run_ai_job(job)
+    return finish_benchmark(op, context, job)
+
+def benchmark_invoke(op, context, event):
+    job = prepare_benchmark(op, context)
+    if job is None:
+        return {'CANCELLED'}
+    op.report({'INFO'}, f"Queued {job.label}")
+    return start_job_modal(op, context, job)
+
+def benchmark_modal(op, context, event):
+    return poll_job_modal(op, context, event, finish_benchmark)
+
+def prepare_benchmark(op, context):
+    tool = context.scene.smart_bone_tool
+    model_type = tool.interpolator_type
+    cwd = tool.film_path if model_type == 'FILM' else tool.tooncrafter_path
+    if not cwd or not tool.model_path:
+        op.report({'ERROR'}, "Set interpolator and model paths")
+        return None
+
+    obj = context.object
+    if not obj or obj.type != 'GPENCIL':
+        op.report({'ERROR'}, "Select Grease Pencil")
+        return None
+
+    try:
+        tuned = dict(ai_worker_options(tool), device="cpu")
+    except ValueError:
+        op.report({'ERROR'}, f"Invalid core list '{tool.ai_cpu_cores}'")
+        return None
+
+    # Every run sees the same inputs and differs from the run it is compared with
+    # (the last field) in one setting, so each speedup is down to that setting;
+    # only inference time is compared. The worker drops autocast for quantized
+    # models, so reduced precision is timed on the unquantized one.
+    preset = AI_PRESETS[tool.ai_preset]
+    threaded = dict(tuned, quantize=False)
+    runs = [("Default", {"device": "cpu"}, 'FP32', None), ("Threads", threaded, 'FP32', 0)]
+    if preset["precision"] != 'FP32':
+        runs.append((preset["precision"], threaded, preset["precision"], 1))
+    if tuned.get("quantize"):
+        runs.append(("Int8", tuned, 'FP32', 1))
+
+    width, height = model_resolution(tool, context.scene)
+    keys = [context.scene.frame_current, context.scene.frame_current + 1]
+    images = [rasterize_gp_object(obj, frame_number, width, height)[..., :3] for frame_number in keys]
+    job = AITweenJob(f"CPU benchmark {model_type.title()}", [])
+    block, descriptor = share_frames(images)
+    job.data.update(shared_input=block, model_type=model_type, seconds=[])
+
+    model_path = tool.model_path
+    idle_timeout = tool.ai_worker_idle_timeout
+
+    def time_run(options, request, job):
+        reply = interpolation_worker.request(job, backend=model_type, cwd=cwd, model_path=model_path,
+                                             idle_timeout=idle_timeout, message=request, options=options)
+        if reply is None:
+            return
+        if "shared" in reply:
+            receive_frames(reply["shared"])
+        job.data["seconds"].append(reply["seconds"])
+
+    # requests are built here, the job thread never reads bpy data
+    stages = []
+    for name, options, precision, baseline in runs:
+        request = ai_worker_request(tool, [], width, height, preset["steps"], 42, precision)
+        request.update(shared=descriptor, shared_reply=True)
+        stages.append((name, functools.partial(time_run, options, request)))
+    job.stages = stages
+    job.data["runs"] = [(name, baseline) for name, options, precision, baseline in runs]
+    return job
+
+def finish_benchmark(op, context, job):
+    job.release()
+    if job in _ai_jobs:
+        _ai_jobs.remove(job)
+    if job.state == 'CANCELLED':
+        op.report({'WARNING'}, f"Cancelled {job.label}")
+        return {'CANCELLED'}
+    if job.state == 'FAILED':
+        op.report({'ERROR'}, f"Benchmark failed: {job.error}")
+        return {'CANCELLED'}
+
+    seconds = job.data["seconds"]
+    timings = [(name, run_seconds, None if baseline is None else seconds[baseline] / max(run_seconds, 1e-6))
+               for (name, baseline), run_seconds in zip(job.data["runs"], seconds)]
+    cpu_benchmarks[job.data["model_type"]] = timings
+    steps = [f"{name} {run_seconds:.1f} s" + (f" ({speedup:.2f}x)" if speedup is not None else "")
+             for name, run_seconds, speedup in timings]
+    op.report({'INFO'}, "CPU " + ", ".join(steps))
+    return {'FINISHED'}
+
+def clear_cache(op, context):
+    tool = context.scene.smart_bone_tool
+    configure_workspace(tool)
+    result_cache.configure(ai_cache_root(tool), tool.ai_cache_budget * 1024 * 1024)
+    result_cache.clear(protected_sequence_dirs())
+    op.report({'INFO'}, f"AI cache now {result_cache.size / 1e6:.1f} MB")
+    return {'FINISHED'}
+
+def free_playback(op, context):
+    free_playback_cache()
+    update_ai_playback(context.scene)
+    return {'FINISHED'}
+
+def clean_workspace(op, context):
+    configure_workspace(context.scene.smart_bone_tool)
+    workspace.enforce(protected_sequence_dirs(), {job.data.get("temp_dir") for job in _ai_jobs})
+    result_cache.prune()
+    op.report({'INFO'}, f"AI workspace now {workspace.usage() / 1e6:.1f} MB")
+    return {'FINISHED'}
+
+def cancel_job(op, context):
+    job = find_ai_job(op.job_id)
+    if job:
+        job.cancel()
+    return {'FINISHED'}
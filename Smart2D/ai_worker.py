@@ -0,0 +1,171 @@
+# Interpolation worker, run as its own Python process from the FILM or
+# ToonCrafter directory; never imported by Blender.
+# Listens on a localhost socket, loads the model once and serves
+# interpolation requests until it has been idle for SB_WORKER_IDLE seconds.
+# Frames travel as float RGB arrays in [0, 1] through shared memory blocks,
+# never as video.
+
+import os
+import sys
+import time
+import traceback
+
+# pin before the numeric libraries start their thread pools
+if os.environ.get("SB_WORKER_CORES") and hasattr(os, "sched_setaffinity"):
+    os.sched_setaffinity(0, {int(core) for core in os.environ["SB_WORKER_CORES"].split(",")})
+
+import numpy as np
+from multiprocessing import shared_memory
+from multiprocessing.connection import Listener
+
+def open_block(**kwargs):
+    # Blender owns the blocks it sends and unlinks the ones we return,
+    # so keep them away from this process's resource tracker
+    try:
+        return shared_memory.SharedMemory(track=False, **kwargs)
+    except TypeError:
+        from multiprocessing import resource_tracker
+        block = shared_memory.SharedMemory(**kwargs)
+        resource_tracker.unregister(block._name, "shared_memory")
+        return block
+
+def read_shared(descriptor):
+    block = open_block(name=descriptor["name"])
+    try:
+        return list(np.array(np.ndarray(descriptor["shape"], dtype=descriptor["dtype"], buffer=block.buf)))
+    finally:
+        block.close()
+
+def write_shared(frames):
+    stack = np.ascontiguousarray(np.stack(frames), dtype=np.float32)
+    block = open_block(create=True, size=max(stack.nbytes, 1))
+    np.ndarray(stack.shape, dtype=np.float32, buffer=block.buf)[:] = stack
+    return block, {"name": block.name, "shape": stack.shape, "dtype": "float32"}
+
+def load_film(model_path, options):
+    if options.get("threads") or options.get("interop_threads"):
+        import tensorflow as tf
+        tf.config.threading.set_intra_op_parallelism_threads(options.get("threads") or 0)
+        tf.config.threading.set_inter_op_parallelism_threads(options.get("interop_threads") or 0)
+    from eval import interpolator as interpolator_lib, util
+    interpolator = interpolator_lib.Interpolator(model_path, None)
+
+    def run(request):
+        # all keyframes go through as one sequence; split the result into per-pair clips
+        images = request.get("images") or [util.read_image(path) for path in request["frames"]]
+        frames = [np.asarray(frame, dtype=np.float32)
+                  for frame in util.interpolate_recursively_from_memory(images, request["times"], interpolator)]
+        step = 2 ** request["times"]
+        clips = [frames[i * step:(i + 1) * step + 1] for i in range(len(images) - 1)]
+        return {"frames": [frame for clip in clips for frame in clip], "counts": [len(clip) for clip in clips]}
+    return run
+
+def load_tooncrafter(model_path, options):
+    sys.path.insert(0, os.path.join(os.getcwd(), "scripts", "evaluation"))
+    import torch
+    if options.get("threads"):
+        torch.set_num_threads(options["threads"])
+    if options.get("interop_threads"):
+        torch.set_num_interop_threads(options["interop_threads"])
+    from PIL import Image
+    from omegaconf import OmegaConf
+    from utils.utils import instantiate_from_config
+    from inference import load_model_checkpoint, image_guided_synthesis
+
+    device = "cuda" if torch.cuda.is_available() and options.get("device") != "cpu" else "cpu"
+    config = OmegaConf.load(os.path.join("configs", "inference_512_v1.0.yaml"))
+    model_config = config.pop("model", OmegaConf.create())
+    model_config["params"]["unet_config"]["params"]["use_checkpoint"] = False
+    model = instantiate_from_config(model_config).to(device)
+    model.perframe_ae = True
+    model = load_model_checkpoint(model, model_path)
+    model.eval()
+    quantized = options.get("quantize") and device == "cpu"
+    if quantized:
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    def to_tensor(image, width, height):
+        if image.shape[:2] != (height, width):
+            image = np.asarray(Image.fromarray((image * 255).astype(np.uint8)).resize((width, height)),
+                               dtype=np.float32) / 255
+        return torch.from_numpy(np.ascontiguousarray(image) * 2.0 - 1.0).permute(2, 0, 1)
+
+    def run(request):
+        # every adjacent keyframe pair is one sample, run batch_size samples at a time
+        torch.manual_seed(request["seed"])
+        width, height, length = request["width"], request["height"], request["video_length"]
+        images = request.get("images") or [np.asarray(Image.open(path).convert("RGB"), dtype=np.float32) / 255
+                                           for path in request["frames"]]
+        keys = [to_tensor(image, width, height) for image in images]
+        pairs = list(zip(keys, keys[1:]))
+        half = length // 2
+        batch_size = max(request.get("batch_size", 1), 1)
+        # int8 linear layers take float32 input, so no autocast on top of them
+        dtype = torch.bfloat16 if request.get("precision") == "BF16" and not quantized else None
+        frames = []
+        counts = []
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start:start + batch_size]
+            video = torch.stack([torch.stack([first] * half + [last] * (length - half), dim=1)
+                                 for first, last in batch]).to(device)
+            noise_shape = [len(batch), model.model.diffusion_model.out_channels, length, height // 8, width // 8]
+            with torch.no_grad(), torch.autocast(device_type=device, dtype=dtype, enabled=dtype is not None):
+                samples = image_guided_synthesis(
+                    model, [request["prompt"]] * len(batch), video, noise_shape,
+                    n_samples=1, ddim_steps=request["steps"], ddim_eta=1.0,
+                    unconditional_guidance_scale=7.5, fs=10, text_input=True,
+                    interp=True, timestep_spacing="uniform_trailing", guidance_rescale=0.7,
+                )
+            clips = ((samples[:, 0].clamp(-1.0, 1.0) + 1.0) / 2.0).permute(0, 2, 3, 4, 1).float().cpu().numpy()
+            for clip in clips:
+                frames.extend(clip)
+                counts.append(len(clip))
+        return {"frames": frames, "counts": counts}
+    return run
+
+LOADERS = {"FILM": load_film, "TOONCRAFTER": load_tooncrafter}
+
+def main():
+    # the backend's own modules come first, not the add-on's
+    sys.path[0] = os.getcwd()
+    listener = Listener(("127.0.0.1", 0), authkey=bytes.fromhex(os.environ["SB_WORKER_AUTHKEY"]))
+    print(listener.address[1], flush=True)
+    # from here on anything the libraries print goes to stderr, not our handshake pipe
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+    conn = listener.accept()
+    idle = float(os.environ.get("SB_WORKER_IDLE", "600"))
+    run = None
+    output = None       # last returned block, held until Blender has copied it
+    while conn.poll(idle):
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if output is not None:
+            output.close()
+            output = None
+        if message["op"] == "quit":
+            break
+        try:
+            begin = time.perf_counter()
+            if message["op"] == "load":
+                run = LOADERS[message["backend"]](message["model_path"], message.get("options", {}))
+                reply = {}
+            else:
+                if "shared" in message:
+                    message["images"] = read_shared(message["shared"])
+                reply = run(message)
+                if message.get("shared_reply") and reply.get("frames"):
+                    output, reply["shared"] = write_shared(reply.pop("frames"))
+            reply.update(ok=True, seconds=time.perf_counter() - begin)
+        except Exception:
+            reply = {"ok": False, "error": traceback.format_exc(limit=3)}
+        conn.send(reply)
+    if output is not None:
+        output.close()
+    conn.close()
+    listener.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import bpy
+
+#---------------------------------------------------------------------
+#    Operators
+#---------------------------------------------------------------------
+
+def add_color(op, context):
+    tool = context.scene.smart_bone_tool
+    item = tool.color_palette.add()
+    return {'FINISHED'}
+
+def easy_colour(op, context):
+    obj = context.object
+    if obj.type != 'GPENCIL':
+        op.report({'ERROR'}, "Select a Grease Pencil object")
+        return {'CANCELLED'}
+
+    tool = context.scene.smart_bone_tool
+    gp = obj.data
+
+    # Create new layer for colour
+    color_layer = gp.layers.new(name="Color_Layer", set_active=True)
+
+    # Fill selected strokes
+    bpy.ops.object.mode_set(mode='EDIT_GPENCIL')
+    bpy.ops.gpencil.select_all(action='SELECT')
+    bpy.ops.gpencil.fill()
+
+    # Apply color from palette (use first for simplicity)
+    if len(tool.color_palette) > 0:
+        color = tool.color_palette[0].color
+        mat = bpy.data.materials.new("Color_Mat")
+        mat.grease_pencil.color = color
+        index = len(gp.materials)
+        gp.materials.append(mat)
+        color_layer.material_index = index
+
+    if tool.fill_type == 'SHADE':
+        # Shade: Duplicate and offset for shadow
+        bpy.ops.gpencil.duplicate()
+        bpy.ops.gpencil.transform_translate(value=(0.01, 0.01, 0))
+
+    # Auto-layering
+    if tool.group_layers:
+        if tool.linked_group_name not in gp.layer_groups:
+            group = gp.layer_groups.new(name=tool.linked_group_name)
+        else:
+            group = gp.layer_groups[tool.linked_group_name]
+        color_layer.layer_group = group
+
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    return {'FINISHED'}
+
+def edit_group(op, context):
+    tool = context.scene.smart_bone_tool
+    if tool.group_layers:
+        # Edit Smart Object like: Unlock group for edit
+        obj = context.object
+        if tool.linked_group_name in obj.data.layer_groups:
+            group = obj.data.layer_groups[tool.linked_group_name]
+            # Perhaps select layers in group or something
+            for layer in obj.data.layers:
+                if layer.layer_group == group:
+                    layer.lock = False
+        bpy.ops.object.mode_set(mode='EDIT_GPENCIL')
+
+    return {'FINISHED'}
@@ -0,0 +1,174 @@
+import bpy
+import os
+import sys
+import hashlib
+import json
+import functools
+import concurrent.futures
+from .ai import AITweenJob, _ai_jobs, run_subprocess, run_ai_job, start_job_modal, poll_job_modal
+
+#---------------------------------------------------------------------
+#    AI Dependencies
+#---------------------------------------------------------------------
+
+AI_PACKAGES = ['tensorflow', 'torch', 'diffusers', 'transformers', 'accelerate', 'mediapy', 'numpy',
+               'scikit-image', 'pyyaml', 'natsort']
+AI_REPOSITORIES = {
+    "frame-interpolation": "https://github.com/google-research/frame-interpolation",
+    "ToonCrafter": "https://github.com/Doubiiu/ToonCrafter",
+}
+
+def has_distributions(names):
+    import importlib.metadata
+    try:
+        for name in names:
+            importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return False
+    return True
+
+class InstallStep:
+    """One installer step, skipped while its inputs are unchanged and its result is still there"""
+
+    def __init__(self, name, commands, after=(), files=(), present=None):
+        self.name = name
+        self.commands = commands        # run in order
+        self.after = after              # names of steps that must finish first
+        self.files = files              # inputs that only exist once earlier steps ran
+        self.present = present          # callable checking the result still exists
+
+    def fingerprint(self):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((sys.version, self.commands)).encode())
+        for path in self.files:
+            if os.path.isfile(path):
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+        return digest.hexdigest()
+
+    def satisfied(self, state):
+        return state.get(self.name) == self.fingerprint() and (self.present is None or self.present())
+
+def install_plan(libs_dir, wheelhouse=""):
+    # pip steps form one chain since two pips can't share site-packages,
+    # clones only wait for themselves
+    pip = [sys.executable, '-m', 'pip', 'install']
+    if wheelhouse:
+        pip += ['--no-index', '--find-links', wheelhouse]
+    setup = [[sys.executable, '-m', 'ensurepip', '--upgrade']]
+    if not wheelhouse:
+        setup.append(pip + ['--upgrade', 'pip'])
+    steps = [
+        InstallStep("pip", setup, present=lambda: has_distributions(['pip'])),
+        InstallStep("packages", [pip + AI_PACKAGES], after=("pip",),
+                    present=lambda: has_distributions(AI_PACKAGES)),
+    ]
+    previous = "packages"
+    for name, url in AI_REPOSITORIES.items():
+        directory = os.path.join(libs_dir, name)
+        mirror = os.path.join(wheelhouse, name) if wheelhouse else ""
+        source = mirror if mirror and os.path.isdir(mirror) else url
+        # an existing checkout is kept as it is, whoever made it
+        clone = InstallStep(f"{name} clone", [] if os.path.isdir(directory) else [['git', 'clone', source, directory]],
+                            present=functools.partial(os.path.isdir, directory))
+        requirements = os.path.join(directory, 'requirements.txt')
+        install = InstallStep(f"{name} requirements", [pip + ['-r', requirements]], after=(clone.name, previous),
+                              files=(requirements,))
+        steps += [clone, install]
+        previous = install.name
+    return steps
+
+def install_waves(steps):
+    # groups of steps whose dependencies are all in earlier groups
+    waves = []
+    placed = set()
+    remaining = list(steps)
+    while remaining:
+        wave = [step for step in remaining if placed.issuperset(step.after)]
+        if not wave:
+            raise RuntimeError("installer steps depend on each other")
+        waves.append(wave)
+        placed.update(step.name for step in wave)
+        remaining = [step for step in remaining if step.name not in placed]
+    return waves
+
+def run_install_step(job, step, state):
+    if step.satisfied(state) or not step.commands:
+        state[step.name] = step.fingerprint()
+        job.data["skipped"].append(step.name)
+        return
+    for command in step.commands:
+        run_subprocess(job, command)
+        if job.cancel_event.is_set():
+            return
+    state[step.name] = step.fingerprint()
+    job.data["installed"].append(step.name)
+
+def run_install_wave(job, wave, state_path):
+    state = job.data["state"]
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(wave)) as pool:
+            for future in [pool.submit(run_install_step, job, step, state) for step in wave]:
+                future.result()
+    finally:
+        # keep what did finish, so a retry picks up from here
+        with open(state_path, 'w') as f:
+            json.dump(state, f, indent=1)
+
+#---------------------------------------------------------------------
+#    Operators
+#---------------------------------------------------------------------
+
+def install_execute(op, context):
+    # blocking path for scripts and background mode
+    job = prepare_install(op, context)
+    run_ai_job(job)
+    return finish_install(op, context, job)
+
+def install_invoke(op, context, event):
+    job = prepare_install(op, context)
+    op.report({'INFO'}, "Installing AI dependencies in the background")
+    return start_job_modal(op, context, job, 0.5)
+
+def install_modal(op, context, event):
+    return poll_job_modal(op, context, event, finish_install)
+
+def prepare_install(op, context):
+    tool = context.scene.smart_bone_tool
+    libs_dir = os.path.join(os.path.dirname(__file__), "libs")
+    os.makedirs(libs_dir, exist_ok=True)
+    wheelhouse = bpy.path.abspath(tool.ai_wheelhouse) if tool.ai_wheelhouse else ""
+
+    # what earlier runs installed, by step name and input fingerprint
+    state_path = os.path.join(libs_dir, "install_state.json")
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+
+    stages = [(", ".join(step.name for step in wave),
+               functools.partial(run_install_wave, wave=wave, state_path=state_path))
+              for wave in install_waves(install_plan(libs_dir, wheelhouse))]
+    job = AITweenJob("AI dependencies", stages)
+    job.data = {"state": state, "installed": [], "skipped": [], "libs_dir": libs_dir}
+    return job
+
+def finish_install(op, context, job):
+    if job in _ai_jobs:
+        _ai_jobs.remove(job)
+    if job.state == 'CANCELLED':
+        op.report({'WARNING'}, "AI dependency install cancelled, finished steps are kept")
+        return {'CANCELLED'}
+    if job.state == 'FAILED':
+        op.report({'ERROR'}, job.error)
+        return {'CANCELLED'}
+
+    # Set paths
+    tool = context.scene.smart_bone_tool
+    tool.film_path = os.path.join(job.data["libs_dir"], "frame-interpolation")
+    tool.tooncrafter_path = os.path.join(job.data["libs_dir"], "ToonCrafter")
+
+    op.report({'INFO'}, f"AI dependencies ready in {job.elapsed:.1f} s: {len(job.data['installed'])} steps run, "
+                          f"{len(job.data['skipped'])} already done. Please set model_path to the model file.")
+    return {'FINISHED'}
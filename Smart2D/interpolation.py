@@ -0,0 +1,358 @@
+import bpy
+import functools
+import threading
+import time
+import collections
+import hashlib
+import concurrent.futures
+import numpy as np
+
+#---------------------------------------------------------------------
+#    Stroke Interpolation
+#---------------------------------------------------------------------
+
+class FrameArrays:
+    """Flat NumPy copy of the strokes in a Grease Pencil frame"""
+
+    def __init__(self, counts, co, pressure, strength, material_index, line_width):
+        self.counts = counts                    # points per stroke
+        self.co = co                            # (points, 3)
+        self.pressure = pressure                # (points,)
+        self.strength = strength                # (points,)
+        self.material_index = material_index    # (strokes,)
+        self.line_width = line_width            # (strokes,)
+
+    @property
+    def offsets(self):
+        return np.cumsum(self.counts) - self.counts
+
+    def fingerprint(self):
+        # content hash, changes whenever any stroke of the frame is edited
+        if getattr(self, "_fingerprint", None) is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for array in (self.counts, self.co, self.pressure, self.strength, self.material_index, self.line_width):
+                digest.update(np.ascontiguousarray(array).tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+def read_frame_arrays(frame):
+    # bulk read every stroke with foreach_get, one call per attribute per stroke
+    strokes = frame.strokes
+    num_strokes = len(strokes)
+    counts = np.fromiter((len(stroke.points) for stroke in strokes), dtype=np.int64, count=num_strokes)
+    total = int(counts.sum())
+    co = np.empty(total * 3, dtype=np.float32)
+    pressure = np.empty(total, dtype=np.float32)
+    strength = np.empty(total, dtype=np.float32)
+    start = 0
+    for stroke, count in zip(strokes, counts):
+        end = start + count
+        if count:
+            points = stroke.points
+            points.foreach_get("co", co[start * 3:end * 3])
+            points.foreach_get("pressure", pressure[start:end])
+            points.foreach_get("strength", strength[start:end])
+        start = end
+    material_index = np.empty(num_strokes, dtype=np.int32)
+    line_width = np.empty(num_strokes, dtype=np.int32)
+    if num_strokes:
+        strokes.foreach_get("material_index", material_index)
+        strokes.foreach_get("line_width", line_width)
+    return FrameArrays(counts, co.reshape(-1, 3), pressure, strength, material_index, line_width)
+
+def write_frame_arrays(frame, arrays):
+    # one strokes.new() per stroke, then bulk foreach_set for its points
+    start = 0
+    for i, count in enumerate(arrays.counts):
+        end = start + count
+        stroke = frame.strokes.new()
+        stroke.material_index = int(arrays.material_index[i])
+        stroke.line_width = int(arrays.line_width[i])
+        if count:
+            points = stroke.points
+            points.add(int(count))
+            points.foreach_set("co", np.ascontiguousarray(arrays.co[start:end]).ravel())
+            points.foreach_set("pressure", np.ascontiguousarray(arrays.pressure[start:end]))
+            points.foreach_set("strength", np.ascontiguousarray(arrays.strength[start:end]))
+        start = end
+
+EASING_POWERS = {'QUAD': 2, 'CUBIC': 3, 'QUART': 4, 'QUINT': 5}
+
+def _ease_in(interp_type, t):
+    if interp_type == 'SINE':
+        return 1.0 - np.cos(t * np.pi / 2)
+    if interp_type in EASING_POWERS:
+        return t ** EASING_POWERS[interp_type]
+    return t
+
+@functools.lru_cache(maxsize=None)
+def easing_table(interp_type, easing, steps):
+    # blend factors for every in-between, computed once per (type, easing, steps)
+    t = np.arange(1, steps + 1, dtype=np.float64) / (steps + 1)
+    if interp_type == 'BEZIER':
+        factors = t * t * (3.0 - 2.0 * t)
+    elif easing == 'EASE_OUT':
+        factors = 1.0 - _ease_in(interp_type, 1.0 - t)
+    elif easing == 'EASE_IN_OUT':
+        factors = np.where(t < 0.5,
+                           _ease_in(interp_type, 2.0 * t) / 2,
+                           1.0 - _ease_in(interp_type, 2.0 - 2.0 * t) / 2)
+    else:
+        # AUTO behaves like EASE_IN, as in the built-in operator
+        factors = _ease_in(interp_type, t)
+    factors = factors.astype(np.float32)
+    factors.flags.writeable = False
+    return factors
+
+def _ragged_arange(counts):
+    # [0..n0-1, 0..n1-1, ...] for a list of run lengths
+    starts = np.cumsum(counts) - counts
+    return np.arange(int(counts.sum())) - np.repeat(starts, counts)
+
+def stroke_centroids(arrays):
+    stroke_id = np.repeat(np.arange(len(arrays.counts)), arrays.counts)
+    divisor = np.maximum(arrays.counts, 1)[:, None]
+    sums = np.stack([np.bincount(stroke_id, weights=arrays.co[:, axis], minlength=len(arrays.counts))
+                     for axis in range(3)], axis=1)
+    return sums / divisor
+
+def match_strokes(a, b):
+    # greedy mutual-nearest matching on stroke centroids, preferring the same material
+    empty = np.empty(0, dtype=np.int64)
+    if not len(a.counts) or not len(b.counts):
+        return empty, empty
+    centroid_a = stroke_centroids(a)
+    centroid_b = stroke_centroids(b)
+    cost = np.linalg.norm(centroid_a[:, None, :] - centroid_b[None, :, :], axis=2)
+    cost += (a.material_index[:, None] != b.material_index[None, :]) * (cost.max() + 1.0)
+    cost[a.counts == 0, :] = np.inf
+    cost[:, b.counts == 0] = np.inf
+
+    rows = np.arange(len(a.counts))
+    matched_a = []
+    matched_b = []
+    while True:
+        row_best = cost.argmin(axis=1)
+        col_best = cost.argmin(axis=0)
+        mutual = (col_best[row_best] == rows) & np.isfinite(cost[rows, row_best])
+        if not mutual.any():
+            break
+        match_a = rows[mutual]
+        match_b = row_best[mutual]
+        matched_a.append(match_a)
+        matched_b.append(match_b)
+        cost[match_a, :] = np.inf
+        cost[:, match_b] = np.inf
+
+    if not matched_a:
+        return empty, empty
+    matched_a = np.concatenate(matched_a)
+    matched_b = np.concatenate(matched_b)
+    order = np.argsort(matched_a)       # keep the draw order of the first keyframe
+    return matched_a[order], matched_b[order]
+
+def resample_strokes(arrays, stroke_index, counts):
+    # arc-length resample the chosen strokes to new point counts, all strokes at once
+    src_counts = arrays.counts[stroke_index]
+    gather = np.repeat(arrays.offsets[stroke_index], src_counts) + _ragged_arange(src_counts)
+    co = arrays.co[gather].astype(np.float64)
+    src_starts = np.cumsum(src_counts) - src_counts
+    src_id = np.repeat(np.arange(len(stroke_index)), src_counts)
+
+    segment = np.zeros(len(co))
+    segment[1:] = np.linalg.norm(np.diff(co, axis=0), axis=1)
+    segment[src_starts] = 0.0
+    length = np.cumsum(segment)
+    length -= np.repeat(length[src_starts], src_counts)
+    total = length[src_starts + src_counts - 1]
+    # zero-length strokes fall back to even spacing by index
+    local = _ragged_arange(src_counts)
+    even = local / np.repeat(np.maximum(src_counts - 1, 1), src_counts)
+    total_rep = np.repeat(total, src_counts)
+    param = np.where(total_rep > 0, length / np.where(total_rep > 0, total_rep, 1.0), even)
+    key = 2.0 * src_id + param          # strictly separated per stroke for searchsorted
+
+    out_id = np.repeat(np.arange(len(stroke_index)), counts)
+    target = 2.0 * out_id + _ragged_arange(counts) / np.repeat(np.maximum(counts - 1, 1), counts)
+    first = np.repeat(src_starts, counts)
+    last = first + np.repeat(src_counts, counts) - 1
+    lo = np.clip(np.searchsorted(key, target, side='right') - 1, first, np.maximum(last - 1, first))
+    hi = np.minimum(lo + 1, last)
+    span = key[hi] - key[lo]
+    weight = np.clip(np.where(span > 0, (target - key[lo]) / np.where(span > 0, span, 1.0), 0.0), 0.0, 1.0)
+
+    lo = gather[lo]
+    hi = gather[hi]
+    w = weight.astype(np.float32)
+    return FrameArrays(
+        counts,
+        arrays.co[lo] + (arrays.co[hi] - arrays.co[lo]) * w[:, None],
+        arrays.pressure[lo] + (arrays.pressure[hi] - arrays.pressure[lo]) * w,
+        arrays.strength[lo] + (arrays.strength[hi] - arrays.strength[lo]) * w,
+        arrays.material_index[stroke_index],
+        arrays.line_width[stroke_index],
+    )
+
+def align_frame_arrays(a, b):
+    # match strokes, then resample each pair to the larger of the two point counts;
+    # strokes without a partner are left out, as in the built-in operator
+    index_a, index_b = match_strokes(a, b)
+    counts = np.maximum(a.counts[index_a], b.counts[index_b])
+    return resample_strokes(a, index_a, counts), resample_strokes(b, index_b, counts)
+
+CORRESPONDENCE_CACHE_SIZE = 256
+_correspondence_cache = collections.OrderedDict()
+_correspondence_lock = threading.Lock()
+
+def correspond_frame_arrays(start, end):
+    # aligned pair from the cache, keyed by content so edits to either frame miss it
+    key = (start.fingerprint(), end.fingerprint())
+    with _correspondence_lock:
+        aligned = _correspondence_cache.get(key)
+        if aligned is not None:
+            _correspondence_cache.move_to_end(key)
+            return aligned
+    aligned = align_frame_arrays(start, end)
+    with _correspondence_lock:
+        _correspondence_cache[key] = aligned
+        while len(_correspondence_cache) > CORRESPONDENCE_CACHE_SIZE:
+            _correspondence_cache.popitem(last=False)
+    return aligned
+
+def blend_frame_arrays(a, b, factors):
+    # blend two aligned frames at every factor at once: (steps, points, 3)
+    t = np.asarray(factors, dtype=np.float32)
+    co = a.co + (b.co - a.co) * t[:, None, None]
+    pressure = a.pressure + (b.pressure - a.pressure) * t[:, None]
+    strength = a.strength + (b.strength - a.strength) * t[:, None]
+    return [FrameArrays(a.counts, co[i], pressure[i], strength[i], a.material_index, a.line_width)
+            for i in range(len(t))]
+
+def interpolate_frame_pair(start, end, factors):
+    # pure NumPy, safe to run on a worker thread
+    aligned_start, aligned_end = correspond_frame_arrays(start, end)
+    return blend_frame_arrays(aligned_start, aligned_end, factors)
+
+def is_extreme(frame, exclude_breakdowns=False):
+    # frames interpolation runs between; breakdowns count unless excluded,
+    # like the built-in Interpolate Sequence
+    return not exclude_breakdowns or frame.keyframe_type != 'BREAKDOWN'
+
+def keyframe_pairs(layer, exclude_breakdowns=False):
+    # adjacent extremes with a gap between them
+    keys = sorted((f for f in layer.frames if is_extreme(f, exclude_breakdowns)), key=lambda f: f.frame_number)
+    return [(a, b) for a, b in zip(keys, keys[1:]) if b.frame_number - a.frame_number > 1]
+
+#---------------------------------------------------------------------
+#    Operators
+#---------------------------------------------------------------------
+
+def interpolate(op, context):
+    if op.type == 'AI':
+        bpy.ops.myops.ai_tween('INVOKE_DEFAULT', exclude_breakdowns=op.exclude_breakdowns)
+    elif op.batch:
+        return interpolate_batch(op, context)
+    else:
+        # Call original logic (approximated)
+        obj = context.object
+        if obj and obj.type == 'GPENCIL':
+            gp = obj.data
+            layer = gp.layers.active
+            if layer:
+                frames = layer.frames
+                current_frame = context.scene.frame_current
+                current_f = None
+                next_f = None
+                for f in frames:
+                    if f.frame_number == current_frame:
+                        current_f = f
+                    elif (f.frame_number > current_frame and is_extreme(f, op.exclude_breakdowns)
+                          and (next_f is None or f.frame_number < next_f.frame_number)):
+                        next_f = f
+                # breakdowns only fit strictly between the two keyframes
+                steps = min(op.steps, next_f.frame_number - current_frame - 1) if next_f else 0
+                if current_f and steps > 0:
+                    factors = easing_table(op.type, op.easing, steps)
+                    blended = interpolate_frame_pair(read_frame_arrays(current_f), read_frame_arrays(next_f), factors)
+                    for step, arrays in enumerate(blended, 1):
+                        new_frame = layer.frames.new(current_frame + step)
+                        new_frame.keyframe_type = 'BREAKDOWN'
+                        write_frame_arrays(new_frame, arrays)
+    return {'FINISHED'}
+
+def interpolate_batch(op, context):
+    obj = context.object
+    if not obj or obj.type != 'GPENCIL':
+        op.report({'ERROR'}, "Select a Grease Pencil object")
+        return {'CANCELLED'}
+
+    gp = obj.data
+    layers = [layer for layer in gp.layers if layer.select and not layer.lock]
+    if not layers and gp.layers.active:
+        layers = [gp.layers.active]
+
+    # Read keyframes once on the main thread; shared keys are only read once
+    jobs = []
+    for layer in layers:
+        existing = {f.frame_number for f in layer.frames}
+        read = {}
+        for start_f, end_f in keyframe_pairs(layer, op.exclude_breakdowns):
+            start_num = start_f.frame_number
+            end_num = end_f.frame_number
+            missing = [n for n in range(start_num + 1, end_num) if n not in existing]
+            if not missing:
+                continue
+            for f in (start_f, end_f):
+                if f.frame_number not in read:
+                    read[f.frame_number] = read_frame_arrays(f)
+            table = easing_table(op.type, op.easing, end_num - start_num - 1)
+            factors = table[[n - start_num - 1 for n in missing]]
+            jobs.append((layer, missing, read[start_num], read[end_num], factors))
+
+    # Geometry for every pair on the worker pool
+    with concurrent.futures.ThreadPoolExecutor() as pool:
+        results = list(pool.map(lambda job: interpolate_frame_pair(job[2], job[3], job[4]), jobs))
+
+    # Single write-back
+    count = 0
+    for (layer, missing, start, end, factors), blended in zip(jobs, results):
+        for frame_number, arrays in zip(missing, blended):
+            new_frame = layer.frames.new(frame_number)
+            new_frame.keyframe_type = 'BREAKDOWN'
+            write_frame_arrays(new_frame, arrays)
+            count += 1
+
+    op.report({'INFO'}, f"Interpolated {count} frames across {len(jobs)} keyframe pairs")
+    return {'FINISHED'}
+
+def benchmark(op, context):
+    obj = context.object
+    if not obj or obj.type != 'GPENCIL' or not obj.data.layers.active:
+        op.report({'ERROR'}, "Select a Grease Pencil object with an active layer")
+        return {'CANCELLED'}
+
+    gp = obj.data
+    frames = sorted(gp.layers.active.frames, key=lambda f: f.frame_number)
+    if len(frames) < 2:
+        op.report({'ERROR'}, "Active layer needs at least two keyframes")
+        return {'CANCELLED'}
+
+    factors = easing_table('LINEAR', 'AUTO', op.steps)
+    scratch = gp.layers.new("SB_Benchmark", set_active=False)
+    elapsed = 0.0
+    points = 0
+    try:
+        for repeat in range(op.repeats):
+            begin = time.perf_counter()
+            start, end = align_frame_arrays(read_frame_arrays(frames[0]), read_frame_arrays(frames[1]))
+            for step, arrays in enumerate(blend_frame_arrays(start, end, factors), 1):
+                write_frame_arrays(scratch.frames.new(step), arrays)
+            elapsed += time.perf_counter() - begin
+            points += len(start.co) * op.steps
+            scratch.clear()
+    finally:
+        gp.layers.remove(scratch)
+
+    rate = points / elapsed if elapsed > 0 else 0.0
+    op.report({'INFO'}, f"{rate:,.0f} points/s ({points} points in {elapsed * 1000:.1f} ms)")
+    return {'FINISHED'}
@@ -0,0 +1,603 @@
+import bpy
+import hashlib
+import math
+import os
+import tempfile
+import time
+import numpy as np
+from .interpolation import read_frame_arrays
+
+#---------------------------------------------------------------------
+#    Bendy Parts
+#---------------------------------------------------------------------
+
+# Parts thinner than this along an axis still get a usable lattice and bones
+MIN_PART_EXTENT = 0.01
+
+def chain_weights(samples, bones):
+    # (samples, bones) weights along a bone chain. Each bone owns the middle of
+    # its segment and hands over to the next with a smoothstep; rows sum to one.
+    weights = np.zeros((samples, bones), dtype=np.float32)
+    if bones == 1:
+        weights[:] = 1.0
+        return weights
+    t = np.linspace(0.0, 1.0, samples) if samples > 1 else np.full(1, 0.5)
+    x = t * bones - 0.5                         # bone centres at 0, 1, ..., bones - 1
+    first = np.clip(np.floor(x).astype(int), 0, bones - 2)
+    f = np.clip(x - first, 0.0, 1.0)
+    s = f * f * (3.0 - 2.0 * f)
+    rows = np.arange(samples)
+    weights[rows, first] = 1.0 - s
+    weights[rows, first + 1] = s
+    return weights
+
+def assign_chain_weights(lattice, bone_names):
+    # one vertex group per bone, weighted by position along the lattice W axis.
+    # Points are stored U fastest, then V, then W, so each W layer is one index range.
+    data = lattice.data
+    layer = data.points_u * data.points_v
+    weights = chain_weights(data.points_w, len(bone_names))
+    for bone, name in enumerate(bone_names):
+        group = lattice.vertex_groups.get(name) or lattice.vertex_groups.new(name=name)
+        for w in np.flatnonzero(weights[:, bone]):
+            group.add(list(range(w * layer, (w + 1) * layer)), float(weights[w, bone]), 'REPLACE')
+
+def part_bounds(obj):
+    # world-space bounding box of an object as (low, high)
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    corners = np.array([tuple(corner) for corner in obj.bound_box]) @ matrix[:3, :3].T + matrix[:3, 3]
+    return corners.min(axis=0), corners.max(axis=0)
+
+def assign_layer_weights(obj, name, exclude):
+    # Full weight in the named group for every point outside the excluded layers.
+    # Legacy GP has no bulk weight API, so this is one weight_set() call per point
+    # of every frame; only run it when some layer really is excluded.
+    if not any(layer.info in exclude for layer in obj.data.layers):
+        return False
+    group = obj.vertex_groups.get(name) or obj.vertex_groups.new(name=name)
+    for layer in obj.data.layers:
+        if layer.info in exclude:
+            continue
+        for frame in layer.frames:
+            for stroke in frame.strokes:
+                points = stroke.points
+                for index in range(len(points)):
+                    points.weight_set(vertex_group_index=group.index, point_index=index, weight=1.0)
+    return True
+
+# Lattice rotation that turns its W (local Z) axis onto each world axis, and the
+# world extents its local X, Y and Z then span
+CHAIN_ORIENTATIONS = {
+    0: ((0.0, math.pi / 2, 0.0), (2, 1, 0)),
+    1: ((-math.pi / 2, 0.0, 0.0), (0, 2, 1)),
+    2: ((0.0, 0.0, 0.0), (0, 1, 2)),
+}
+
+def rig_bendy_parts(context, parts, tool):
+    # One armature with a bone chain per part, each part bent by its own lattice.
+    # Bones can only be added in edit mode, so the armature enters it once for
+    # all parts; everything else is built through bpy.data.
+    collection = context.collection
+    armature = bpy.data.objects.new("Bendy_Armature", bpy.data.armatures.new("Bendy_Armature"))
+    collection.objects.link(armature)
+
+    # chains follow the part's longest side; drawings are flat, so that is the
+    # longer of the two axes in the drawing plane, whichever view it was drawn in
+    boxes = []
+    for obj in parts:
+        low, high = part_bounds(obj)
+        high = np.maximum(high, low + MIN_PART_EXTENT)
+        boxes.append((low, high, int(np.argmax(high - low))))
+
+    if context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+    previous = context.view_layer.objects.active
+    context.view_layer.objects.active = armature
+    bpy.ops.object.mode_set(mode='EDIT')
+    edit_bones = armature.data.edit_bones
+    count = tool.bendy_bone_count
+    chains = []
+    for obj, (low, high, axis) in zip(parts, boxes):
+        centre = (low + high) / 2
+        ends = np.linspace(low[axis], high[axis], count + 1)
+        names = []
+        parent = None
+        for i in range(count):
+            bone = edit_bones.new(f"{obj.name}.{i:03d}")
+            head = centre.copy()
+            head[axis] = ends[i]
+            tail = centre.copy()
+            tail[axis] = ends[i + 1]
+            bone.head = head
+            bone.tail = tail
+            bone.parent = parent
+            bone.use_connect = parent is not None
+            bone.bbone_segments = tool.bone_segments
+            names.append(bone.name)
+            parent = bone
+        chains.append(names)
+    bpy.ops.object.mode_set(mode='OBJECT')
+    context.view_layer.objects.active = previous
+
+    exclude = {name.strip() for name in tool.exclude_layers.split(',') if name.strip()}
+    for obj, (low, high, axis), names in zip(parts, boxes, chains):
+        # Lattice around the part, its W axis along the chain
+        data = bpy.data.lattices.new("Bendy_Lattice")
+        data.points_w = tool.lattice_resolution
+        lattice = bpy.data.objects.new("Bendy_Lattice", data)
+        collection.objects.link(lattice)
+        size = high - low
+        lattice.location = (low + high) / 2
+        rotation, extents = CHAIN_ORIENTATIONS[axis]
+        lattice.rotation_euler = rotation
+        lattice.scale = size[list(extents)]
+
+        # Armature Modifier on Lattice
+        mod = lattice.modifiers.new(type='ARMATURE', name="Armature")
+        mod.object = armature
+        assign_chain_weights(lattice, names)
+        mark_bendy_lattice(lattice, tool)
+
+        # Lattice Modifier on GP, limited to the layers not excluded
+        mod_gp = obj.grease_pencil_modifiers.new(type='GP_LATTICE', name="Lattice")
+        mod_gp.object = lattice
+        if assign_layer_weights(obj, "Lattice", exclude):
+            mod_gp.vertex_group = "Lattice"
+    return armature
+
+#---------------------------------------------------------------------
+#    Playback LOD
+#---------------------------------------------------------------------
+
+# Bendy lattices are marked with their rig-time resolution and carry per-part LOD
+# overrides as custom properties; an override of -1 follows the scene setting, 0
+# keeps the part at its resolution during playback.
+LOD_OVERRIDES = {
+    "sb_lod_points": "Lattice W points while playing back (-1: scene setting, 0: never reduce)",
+    "sb_lod_segments": "B-Bone segments while playing back (-1: scene setting, 0: never reduce)",
+}
+
+# lattice name -> (points_w, co_deform, {(group, weight): point indices},
+# {bone: bbone_segments}) as they were before playback lowered the lattice. Lowering
+# regenerates points and weights, so restoring puts back exactly this, edits included.
+_lod_snapshots = {}
+
+def mark_bendy_lattice(lattice, tool):
+    lattice["sb_full_points"] = tool.lattice_resolution
+    lattice["sb_full_segments"] = tool.bone_segments
+    for key, description in LOD_OVERRIDES.items():
+        lattice[key] = -1
+        lattice.id_properties_ui(key).update(min=-1, max=64, description=description)
+
+def lod_level(lattice, key, default, full):
+    override = lattice.get(key, -1)
+    value = default if override < 0 else override
+    return min(value, full) if value > 0 else full
+
+def chain_bones(lattice):
+    # the bones bending a lattice, one per vertex group
+    names = [group.name for group in lattice.vertex_groups]
+    bones = []
+    for mod in lattice.modifiers:
+        if mod.type == 'ARMATURE' and mod.object and mod.object.type == 'ARMATURE':
+            bones += [bone for bone in (mod.object.data.bones.get(name) for name in names) if bone is not None]
+    return bones
+
+def snapshot_lattice(lattice, bones):
+    points = lattice.data.points
+    co = np.empty(len(points) * 3, dtype=np.float32)
+    points.foreach_get("co_deform", co)
+    weights = {}
+    for index, point in enumerate(points):
+        for element in point.groups:
+            weights.setdefault((element.group, element.weight), []).append(index)
+    return lattice.data.points_w, co, weights, {bone.name: bone.bbone_segments for bone in bones}
+
+def restore_lattice(lattice, snapshot):
+    points_w, co, weights, segments = snapshot
+    if lattice.data.points_w != points_w:
+        lattice.data.points_w = points_w
+    points = lattice.data.points
+    points.foreach_set("co_deform", co)
+    groups = lattice.vertex_groups
+    everything = list(range(len(points)))
+    for group in groups:
+        group.remove(everything)
+    for (group, weight), indices in weights.items():
+        if group < len(groups):
+            groups[group].add(indices, weight, 'REPLACE')
+    for bone in chain_bones(lattice):
+        if bone.name in segments:
+            bone.bbone_segments = segments[bone.name]
+
+def forget_bendy_lod():
+    _lod_snapshots.clear()
+
+def set_bendy_lod(scene, low):
+    # reduced resolution for every bendy part in the scene, or back to what it was
+    if not low:
+        for name, snapshot in _lod_snapshots.items():
+            lattice = bpy.data.objects.get(name)
+            if lattice is not None and lattice.type == 'LATTICE':
+                restore_lattice(lattice, snapshot)
+        forget_bendy_lod()
+        return
+    tool = scene.smart_bone_tool
+    for lattice in scene.objects:
+        if lattice.type != 'LATTICE' or "sb_full_points" not in lattice or lattice.name in _lod_snapshots:
+            continue
+        bones = chain_bones(lattice)
+        full = lattice.data.points_w
+        points = lod_level(lattice, "sb_lod_points", tool.bendy_lod_points, full)
+        segments = [lod_level(lattice, "sb_lod_segments", tool.bendy_lod_segments, bone.bbone_segments)
+                    for bone in bones]
+        if points == full and all(bone.bbone_segments == count for bone, count in zip(bones, segments)):
+            continue
+        _lod_snapshots[lattice.name] = snapshot_lattice(lattice, bones)
+        if points != full:
+            # resizing reallocates the points, so weight the new layers again
+            lattice.data.points_w = points
+            assign_chain_weights(lattice, [group.name for group in lattice.vertex_groups])
+        for bone, count in zip(bones, segments):
+            bone.bbone_segments = count
+
+#---------------------------------------------------------------------
+#    Baked Deformation
+#---------------------------------------------------------------------
+
+# A bake holds the stroke positions a part's modifier stack produces, up to and
+# including its lattice, for every frame of a range: one (points, 3) float32 .npy per
+# part, named after its bake key, frames back to back in layer order, with per-frame
+# offsets on the object. Baked playback never writes to the part's own drawing: baking
+# also makes a hidden copy of the part without those modifiers, playback only swaps
+# which of the two is visible and writes each frame's positions into the copy. A file
+# saved or recovered mid-playback gets its parts back when it is loaded.
+
+# part name -> memory-mapped positions of the parts playing back baked
+_bake_maps = {}
+# part name -> the copy shown in its place
+_bake_proxies = {}
+
+def lattice_modifier(obj):
+    for mod in obj.grease_pencil_modifiers:
+        if mod.type == 'GP_LATTICE' and mod.object and "sb_full_points" in mod.object:
+            return mod
+    return None
+
+def bendy_parts(objects):
+    return [obj for obj in objects
+            if obj.type == 'GPENCIL' and "sb_bake_proxy" not in obj and lattice_modifier(obj)]
+
+def baked_modifiers(obj):
+    # the part of the stack a bake replaces, and the modifiers after it
+    mods = list(obj.grease_pencil_modifiers)
+    split = mods.index(lattice_modifier(obj)) + 1
+    return mods[:split], mods[split:]
+
+def shown_drawing(layer, frame):
+    # the layer's drawing at a frame, the last key at or before it
+    shown = None
+    for drawing in layer.frames:
+        if drawing.frame_number <= frame and (shown is None or drawing.frame_number > shown.frame_number):
+            shown = drawing
+    return shown
+
+def write_positions(drawing, co):
+    start = 0
+    for stroke in drawing.strokes:
+        count = len(stroke.points)
+        if count:
+            stroke.points.foreach_set("co", np.ascontiguousarray(co[start:start + count], dtype=np.float32).ravel())
+        start += count
+
+def bake_root(tool):
+    if tool.bendy_bake_dir:
+        return bpy.path.abspath(tool.bendy_bake_dir)
+    if bpy.data.filepath:
+        return bpy.path.abspath("//bendy_bake")
+    return os.path.join(tempfile.gettempdir(), "smart2d_bendy_bake")
+
+def hash_fcurves(digest, fcurves):
+    for fcurve in fcurves:
+        keys = fcurve.keyframe_points
+        co = np.empty(len(keys) * 6, dtype=np.float32)
+        keys.foreach_get("co", co[:len(keys) * 2])
+        keys.foreach_get("handle_left", co[len(keys) * 2:len(keys) * 4])
+        keys.foreach_get("handle_right", co[len(keys) * 4:])
+        digest.update(f"{fcurve.data_path}[{fcurve.array_index}] {fcurve.mute}".encode())
+        digest.update(co.tobytes())
+
+def hash_motion(digest, ob):
+    # what moves an object: its action, NLA strips and drivers, or its transform
+    # when nothing animates it, and its constraints
+    anim = ob.animation_data
+    if anim is None or not (anim.action or len(anim.nla_tracks) or len(anim.drivers)):
+        digest.update(np.array(ob.matrix_basis, dtype=np.float32).tobytes())
+    else:
+        if anim.action:
+            digest.update(anim.action.name.encode())
+            hash_fcurves(digest, anim.action.fcurves)
+        for track in anim.nla_tracks:
+            digest.update(f"{track.name} {track.mute} {track.is_solo}".encode())
+            for strip in track.strips:
+                digest.update(f"{strip.name} {strip.frame_start} {strip.frame_end} {strip.blend_type} "
+                              f"{strip.influence} {strip.scale} {strip.repeat} {strip.mute}".encode())
+                if strip.action:
+                    hash_fcurves(digest, strip.action.fcurves)
+        for fcurve in anim.drivers:
+            driver = fcurve.driver
+            digest.update(f"{driver.type} {driver.expression}".encode())
+            for variable in driver.variables:
+                for target in variable.targets:
+                    digest.update(f"{variable.name} {variable.type} {target.id.name if target.id else ''} "
+                                  f"{target.data_path} {target.bone_target} {target.transform_type}".encode())
+        hash_fcurves(digest, anim.drivers)
+    constraints = list(ob.constraints)
+    if ob.type == 'ARMATURE':
+        constraints += [constraint for bone in ob.pose.bones for constraint in bone.constraints]
+    for constraint in constraints:
+        target = getattr(constraint, "target", None)
+        digest.update(f"{constraint.type} {constraint.name} {constraint.mute} {constraint.influence} "
+                      f"{target.name if target else ''} {getattr(constraint, 'subtarget', '')}".encode())
+
+def lattice_state(lattice):
+    # the lattice as the user left it, also while playback has it lowered
+    snapshot = _lod_snapshots.get(lattice.name)
+    return snapshot if snapshot is not None else snapshot_lattice(lattice, chain_bones(lattice))
+
+def keyed_bones(ob):
+    # bones an armature's action, NLA strips or drivers pose
+    anim = ob.animation_data
+    if anim is None:
+        return set()
+    actions = [anim.action] + [strip.action for track in anim.nla_tracks for strip in track.strips]
+    fcurves = list(anim.drivers) + [fcurve for action in actions if action for fcurve in action.fcurves]
+    return {fcurve.data_path.split('"')[1] for fcurve in fcurves if fcurve.data_path.startswith('pose.bones["')}
+
+def bake_key(obj):
+    # changes whenever the drawing or anything bending or moving it does
+    digest = hashlib.blake2b(digest_size=16)
+    for layer in obj.data.layers:
+        digest.update(layer.info.encode())
+        for drawing in layer.frames:
+            digest.update(drawing.frame_number.to_bytes(8, "little", signed=True))
+            digest.update(read_frame_arrays(drawing).fingerprint().encode())
+    head, tail = baked_modifiers(obj)
+    digest.update(" ".join(f"{mod.type}:{mod.name}" for mod in head).encode())
+    hash_motion(digest, obj)
+    lattice = lattice_modifier(obj).object
+    hash_motion(digest, lattice)
+    points_w, co, weights, segments = lattice_state(lattice)
+    digest.update(f"{points_w} {sorted(segments.items())}".encode())
+    digest.update(co.tobytes())
+    for (group, weight), indices in sorted(weights.items()):
+        digest.update(f"{group} {weight}".encode())
+        digest.update(np.array(indices, dtype=np.int32).tobytes())
+    for mod in lattice.modifiers:
+        if mod.type != 'ARMATURE' or not mod.object or mod.object.type != 'ARMATURE':
+            continue
+        armature = mod.object
+        hash_motion(digest, armature)
+        # a pose nothing keys stays put across frames, so it is part of the rig
+        keyed = keyed_bones(armature)
+        for bone in armature.pose.bones:
+            if bone.name not in keyed:
+                digest.update(np.array(bone.matrix_basis, dtype=np.float32).tobytes())
+        bones = armature.data.bones
+        rest = np.empty(len(bones) * 6, dtype=np.float32)
+        bones.foreach_get("head_local", rest[:len(bones) * 3])
+        bones.foreach_get("tail_local", rest[len(bones) * 3:])
+        digest.update(rest.tobytes())
+    return digest.hexdigest()
+
+def bake_path(directory, obj, key):
+    # the key in the name keeps bakes of same-named parts in other files apart
+    return os.path.join(directory, f"{bpy.path.clean_name(obj.name)}-{key}.npy")
+
+def clear_bake(obj, delete=True):
+    # forgetting a stale bake leaves the file, another file with the same drawing
+    # and rig may still play it back
+    path = obj.get("sb_bake_file")
+    if delete and path and os.path.isfile(path):
+        os.remove(path)
+    for key in ("sb_bake_file", "sb_bake_start", "sb_bake_offsets"):
+        if key in obj:
+            del obj[key]
+
+def load_bake(obj):
+    # memory-map a part's bake, or None when the drawing or rig has changed since; a
+    # stale bake is kept until the part is baked again or cleared
+    path = obj.get("sb_bake_file")
+    if not path or not os.path.isfile(path) or not path.endswith(f"-{bake_key(obj)}.npy"):
+        return None
+    return np.load(path, mmap_mode='r')
+
+def bake_proxy(obj):
+    proxy = obj.get("sb_bake_copy")
+    return proxy if proxy is not None and proxy.get("sb_bake_proxy") == obj else None
+
+def add_bake_proxy(obj):
+    # copy of the part without the baked modifiers, hidden until baked playback
+    proxy = obj.copy()
+    proxy.data = obj.data.copy()
+    proxy.name = f"{obj.name}.bake"
+    head, tail = baked_modifiers(obj)
+    for name in [mod.name for mod in head]:
+        proxy.grease_pencil_modifiers.remove(proxy.grease_pencil_modifiers[name])
+    for key in ("sb_bake_file", "sb_bake_start", "sb_bake_offsets", "sb_bake_copy"):
+        if key in proxy:
+            del proxy[key]
+    proxy["sb_bake_proxy"] = obj
+    proxy.hide_viewport = proxy.hide_render = proxy.hide_select = True
+    for collection in obj.users_collection:
+        collection.objects.link(proxy)
+    obj["sb_bake_copy"] = proxy
+    return proxy
+
+def remove_bake_proxy(obj):
+    # give the part back its own visibility and delete its copy
+    proxy = bake_proxy(obj)
+    if "sb_bake_copy" in obj:
+        del obj["sb_bake_copy"]
+    if proxy is None:
+        return
+    show_bake_proxy(obj, proxy, False)
+    data = proxy.data
+    bpy.data.objects.remove(proxy)
+    if data.users == 0:
+        bpy.data.grease_pencils.remove(data)
+
+def show_bake_proxy(obj, proxy, baked):
+    # swap the part for its copy, the copy taking over the part's visibility
+    if bool(proxy.get("sb_bake_showing")) == baked:
+        return
+    if baked:
+        proxy["sb_bake_hidden"] = [int(obj.hide_viewport), int(obj.hide_render)]
+        proxy.hide_viewport, proxy.hide_render = obj.hide_viewport, obj.hide_render
+        obj.hide_viewport = obj.hide_render = True
+    else:
+        obj.hide_viewport, obj.hide_render = (bool(flag) for flag in proxy["sb_bake_hidden"])
+        proxy.hide_viewport = proxy.hide_render = True
+    proxy["sb_bake_showing"] = int(baked)
+
+def hide_bake_proxies():
+    # copies left shown in a file saved or recovered during baked playback
+    for proxy in bpy.data.objects:
+        obj = proxy.get("sb_bake_proxy")
+        if obj is not None and proxy.get("sb_bake_showing"):
+            show_bake_proxy(obj, proxy, False)
+
+def forget_bendy_bake():
+    _bake_maps.clear()
+    _bake_proxies.clear()
+
+def set_bendy_bake(scene, baked):
+    # switch baked playback on for the valid bakes that fit the memory budget, or off
+    if not baked:
+        for name, proxy in _bake_proxies.items():
+            obj = bpy.data.objects.get(name)
+            if obj is not None:
+                show_bake_proxy(obj, proxy, False)
+        forget_bendy_bake()
+        return
+    budget = scene.smart_bone_tool.bendy_bake_budget * 1024 * 1024
+    used = sum(positions.nbytes for positions in _bake_maps.values())
+    for obj in bendy_parts(scene.objects):
+        if obj.name in _bake_maps:
+            continue
+        proxy = bake_proxy(obj)
+        positions = load_bake(obj) if proxy is not None else None
+        if positions is not None and used + positions.nbytes <= budget:
+            _bake_maps[obj.name] = positions
+            _bake_proxies[obj.name] = proxy
+            used += positions.nbytes
+
+def apply_bendy_bake(scene):
+    # write the current frame's baked positions into the copy of every baked part
+    frame = scene.frame_current
+    for name, positions in _bake_maps.items():
+        obj = scene.objects.get(name)
+        proxy = _bake_proxies.get(name)
+        if obj is None or proxy is None:
+            continue
+        offsets = obj["sb_bake_offsets"]
+        index = frame - obj["sb_bake_start"]
+        drawings = [shown_drawing(layer, frame) for layer in proxy.data.layers]
+        drawings = [drawing for drawing in drawings if drawing is not None]
+        counts = [sum(len(stroke.points) for stroke in drawing.strokes) for drawing in drawings]
+        # outside the baked range the live part takes over
+        baked = 0 <= index < len(offsets) - 1 and sum(counts) == offsets[index + 1] - offsets[index]
+        show_bake_proxy(obj, proxy, baked)
+        if not baked:
+            continue
+        start = offsets[index]
+        for drawing, count in zip(drawings, counts):
+            write_positions(drawing, positions[start:start + count])
+            start += count
+        proxy.data.update_tag()
+
+#---------------------------------------------------------------------
+#    Operators
+#---------------------------------------------------------------------
+
+def add_bendy_part(op, context):
+    if op.batch:
+        parts = [obj for obj in context.selected_objects if obj.type == 'GPENCIL']
+        if not parts:
+            op.report({'ERROR'}, "Select Grease Pencil objects")
+            return {'CANCELLED'}
+    else:
+        obj = context.object
+        if not obj or obj.type != 'GPENCIL':
+            op.report({'ERROR'}, "Select a Grease Pencil object")
+            return {'CANCELLED'}
+        parts = [obj]
+
+    begin = time.perf_counter()
+    armature = rig_bendy_parts(context, parts, context.scene.smart_bone_tool)
+    op.report({'INFO'}, f"Rigged {len(parts)} bendy part{'s' if len(parts) > 1 else ''} on {armature.name} "
+                        f"in {(time.perf_counter() - begin) * 1000:.1f} ms")
+    return {'FINISHED'}
+
+def bake_bendy_parts(op, context):
+    scene = context.scene
+    tool = scene.smart_bone_tool
+    parts = bendy_parts(context.selected_objects) or bendy_parts(scene.objects)
+    if not parts:
+        op.report({'ERROR'}, "No bendy parts to bake")
+        return {'CANCELLED'}
+    directory = bake_root(tool)
+    os.makedirs(directory, exist_ok=True)
+
+    begin = time.perf_counter()
+    current = scene.frame_current
+    frames = range(scene.frame_start, scene.frame_end + 1)
+    keys = {obj.name: bake_key(obj) for obj in parts}
+    # only the stack up to the lattice is baked, later modifiers keep running live
+    tails = [(mod, mod.show_viewport) for obj in parts for mod in baked_modifiers(obj)[1]]
+    for mod, shown in tails:
+        mod.show_viewport = False
+    samples = {obj.name: [] for obj in parts}
+    try:
+        for frame in frames:
+            scene.frame_set(frame)
+            depsgraph = context.evaluated_depsgraph_get()
+            for obj in parts:
+                evaluated = obj.evaluated_get(depsgraph)
+                samples[obj.name].append([read_frame_arrays(layer.active_frame).co
+                                          for layer in evaluated.data.layers if layer.active_frame])
+    finally:
+        for mod, shown in tails:
+            mod.show_viewport = shown
+        scene.frame_set(current)
+
+    size = 0
+    for obj in parts:
+        clear_bake(obj, delete=False)
+        _bake_maps.pop(obj.name, None)
+        _bake_proxies.pop(obj.name, None)
+        remove_bake_proxy(obj)
+        add_bake_proxy(obj)
+        per_frame = [np.concatenate(layers) if layers else np.empty((0, 3), dtype=np.float32)
+                     for layers in samples[obj.name]]
+        positions = np.concatenate(per_frame)
+        path = bake_path(directory, obj, keys[obj.name])
+        np.save(path, positions)
+        obj["sb_bake_file"] = path
+        obj["sb_bake_start"] = frames.start
+        obj["sb_bake_offsets"] = np.concatenate(([0], np.cumsum([len(co) for co in per_frame]))).tolist()
+        size += positions.nbytes
+    op.report({'INFO'}, f"Baked {len(parts)} bendy part{'s' if len(parts) > 1 else ''} over {len(frames)} frames "
+                        f"({size / (1024 * 1024):.1f} MB) in {time.perf_counter() - begin:.1f} s")
+    return {'FINISHED'}
+
+def clear_bendy_bake(op, context):
+    parts = bendy_parts(context.selected_objects) or bendy_parts(context.scene.objects)
+    cleared = [obj for obj in parts if "sb_bake_file" in obj]
+    for obj in cleared:
+        _bake_maps.pop(obj.name, None)
+        _bake_proxies.pop(obj.name, None)
+        remove_bake_proxy(obj)
+        clear_bake(obj)
+    op.report({'INFO'}, f"Cleared {len(cleared)} bendy bake{'s' if len(cleared) != 1 else ''}")
+    return {'FINISHED'}